@@ -0,0 +1,46 @@
+"""Shared pytest fixtures for tests/ and the root-level integration tests."""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def synthetic_dataset():
+    """Synthetic KKBOX tables, generated once per test session."""
+    from tests.fixtures.generate_synthetic import generate_kkbox_dataset
+
+    return generate_kkbox_dataset(1000)
+
+
+@pytest.fixture(scope="session")
+def synthetic_fixture_dir(synthetic_dataset, tmp_path_factory):
+    """Directory holding the synthetic tables as Parquet files, written once per session.
+
+    Tests that mutate files should copy this directory into their own tmp_path.
+    """
+    from tests.fixtures.generate_synthetic import write_fixture_files
+
+    fixture_dir = tmp_path_factory.mktemp("fixtures")
+    write_fixture_files(synthetic_dataset, fixture_dir)
+    return fixture_dir
+
+
+@pytest.fixture(scope="session")
+def synthetic_duckdb(synthetic_dataset):
+    """DuckDB connection with the synthetic tables registered as in-memory views."""
+    duckdb = pytest.importorskip("duckdb")
+
+    from tests.fixtures.generate_synthetic import register_synthetic_tables
+
+    con = register_synthetic_tables(duckdb.connect(), synthetic_dataset)
+    yield con
+    con.close()
+
+
+@pytest.fixture
+def duckdb_con():
+    """Fresh in-memory DuckDB connection, closed after the test."""
+    duckdb = pytest.importorskip("duckdb")
+
+    con = duckdb.connect()
+    yield con
+    con.close()
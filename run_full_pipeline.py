@@ -237,7 +237,7 @@ def main():
     print("  - models/training_metrics.json")
     print("  - models/best_hyperparameters.json")
     print("  - models/lightgbm.pkl")
-    print("  - models/xgboost.pkl")
+    print("  - models/xgb.json")
     if Path("models/stacked_ensemble.pkl").exists():
         print("  - models/stacked_ensemble.pkl")
 
@@ -173,6 +173,7 @@ def export_model_metrics() -> list[dict[str, Any]]:
     model_display_names = {
         "logistic_regression": "Logistic Regression",
         "random_forest": "Random Forest",
+        "hist_gbt": "HistGradientBoosting",
         "xgboost": "XGBoost",
         "lightgbm": "LightGBM",
         "xgb_lgb_ensemble": "XGB+LGB Ensemble",
@@ -48,8 +48,10 @@ def load_data_and_models():
     try:
         import xgboost as xgb
 
-        xgb_path = models_dir / "xgboost.json"
-        if xgb_path.exists():
+        # xgboost.json from models.py, xgb.json from train_temporal.py
+        json_paths = [models_dir / "xgboost.json", models_dir / "xgb.json"]
+        xgb_path = next((p for p in json_paths if p.exists()), None)
+        if xgb_path is not None:
             model = xgb.XGBClassifier()
             model.load_model(str(xgb_path))
             print("  Loaded XGBoost model (JSON)")
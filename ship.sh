@@ -136,7 +136,7 @@ success_msg "README updated with latest metrics"
 
 # Step 8: Final validation
 echo -e "\n🔍 STEP 8: Final Validation"
-python3 test_integration.py || error_exit "Integration tests failed"
+python3 -m pytest -q test_integration.py || error_exit "Integration tests failed"
 
 # Performance check
 echo -e "\n⚡ Performance Validation:"
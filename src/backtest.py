@@ -18,6 +18,7 @@ Example default windows:
 from __future__ import annotations
 
 import argparse
+import functools
 from datetime import date
 from pathlib import Path
 
@@ -47,6 +48,21 @@ def end_of_prev_month(d: date) -> date:
     return (pd.Timestamp(d.replace(day=1)) - pd.Timedelta(days=1)).date()
 
 
+def scan_source(path: Path | str, registered: bool = False) -> str:
+    """
+    DuckDB FROM-clause source for `path`: read_parquet for .parquet, else read_csv_auto.
+
+    With registered=True, `path` is the name of a table/view already registered on the
+    connection (e.g. an in-memory DataFrame via con.register) and is used as-is.
+    """
+    if registered:
+        return str(path)
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return f"read_parquet('{path}')"
+    return f"read_csv_auto('{path}')"
+
+
 def expected_calibration_error(y, p, n_bins=15):
     bins = np.linspace(0, 1, n_bins + 1)
     idx = np.digitize(p, bins) - 1
@@ -62,6 +78,40 @@ def expected_calibration_error(y, p, n_bins=15):
 
 
 # ---- Feature build
+@functools.cache
+def read_sql_template(sql_path: Path) -> str:
+    """Contents of the SQL template at `sql_path`, read once per process."""
+    return Path(sql_path).read_text()
+
+
+@functools.cache
+def compile_feature_sql(
+    sql_path: Path,
+    train_path: Path | str,
+    transactions_path: Path | str,
+    user_logs_path: Path | str,
+    members_path: Path | str,
+    registered: bool = False,
+) -> str:
+    """
+    Feature SQL with input sources substituted and the cutoff left as parameter $1.
+
+    Cached per (template, sources), so successive windows only re-bind the cutoff.
+    """
+    sql = read_sql_template(Path(sql_path))
+    paths = {
+        "train_path": train_path,
+        "transactions_path": transactions_path,
+        "user_logs_path": user_logs_path,
+        "members_path": members_path,
+    }
+    for name, path in paths.items():
+        # Templates scan inputs with read_csv_auto; swap in the reader matching the file format
+        sql = sql.replace(f"read_csv_auto('${{{name}}}')", scan_source(path, registered))
+        sql = sql.replace(f"${{{name}}}", str(path))
+    return sql.replace("DATE '2017-02-28'", "CAST($1 AS DATE)")
+
+
 def build_features(
     con: duckdb.DuckDBPyConnection,
     sql_path: Path,
@@ -70,69 +120,24 @@ def build_features(
     transactions_path: Path,
     user_logs_path: Path,
     members_path: Path,
-) -> pd.DataFrame:
-    sql = Path(sql_path).read_text()
-    sql = (
-        sql.replace("${train_path}", str(train_path))
-        .replace("${transactions_path}", str(transactions_path))
-        .replace("${user_logs_path}", str(user_logs_path))
-        .replace("${members_path}", str(members_path))
-        .replace("DATE '2017-02-28'", f"DATE '{cutoff.isoformat()}'")
-    )
-    return con.execute(sql).fetchdf()
-
-
-# ---- Label build (matching Kaggle winner's labeler_v5.py logic)
-def labels_for_expire_month(
-    con, transactions_csv: Path, expire_month: str, window_days: int = 30
+    registered: bool = False,
 ) -> pd.DataFrame:
     """
-    Generate churn labels matching Bryan Gregory's labeler_v5.py logic.
-
-    A user is labeled for a target month if:
-    1. They have a transaction with membership_expire_date in target month
-    2. The transaction is NOT a cancellation (is_cancel=0)
-    3. The transaction_date is BEFORE the target month (critical!)
-
-    A user churns if:
-    1. No subsequent transaction within 30 days of expiration, OR
-    2. Subsequent transactions don't extend membership beyond expiration
+    Build features as-of `cutoff` from the SQL template at `sql_path`.
 
-    NOTE: This function combines both transactions.csv (v1) and transactions_v2.csv
-    to match the winner's approach. The v2 file is a supplement with March 2017 data.
+    The *_path arguments are CSV/Parquet files, or, with registered=True, names of
+    relations already registered on `con` (skips file I/O entirely).
     """
-    first, last = month_bounds(expire_month)
-    # Target month in YYYYMM format (e.g., 201703 for March 2017)
-    y, m = parse_month(expire_month)
-    target_ym = y * 100 + m
-
-    # Determine paths for both v1 and v2 transaction files
-    tx_csv = Path(transactions_csv)
-    tx_dir = tx_csv.parent
+    sql = compile_feature_sql(
+        Path(sql_path), train_path, transactions_path, user_logs_path, members_path, registered
+    )
+    return con.execute(sql, [cutoff]).fetchdf()
 
-    # Check for v1 file in parent directories
-    v1_candidates = [
-        tx_dir.parent / "transactions.csv",  # kkbox-churn-prediction-challenge/transactions.csv
-        tx_dir / "transactions.csv",
-        tx_dir.parent.parent / "transactions.csv",
-    ]
-    v1_path = None
-    for candidate in v1_candidates:
-        if candidate.exists():
-            v1_path = candidate
-            break
 
-    # Build UNION of both transaction files
-    if v1_path and v1_path != tx_csv:
-        tx_union = f"""
-        SELECT * FROM read_csv_auto('{v1_path}', IGNORE_ERRORS=TRUE)
-        UNION ALL
-        SELECT * FROM read_csv_auto('{tx_csv}', IGNORE_ERRORS=TRUE)
-        """
-    else:
-        tx_union = f"SELECT * FROM read_csv_auto('{tx_csv}', IGNORE_ERRORS=TRUE)"
-
-    q = f"""
+# ---- Label build (matching Kaggle winner's labeler_v5.py logic)
+def _labels_query(tx_union: str, target_ym: int, window_days: int) -> str:
+    """Churn-label SQL over the transactions selected by `tx_union`."""
+    return f"""
     WITH tx_raw AS (
       {tx_union}
     ),
@@ -193,7 +198,74 @@ def labels_for_expire_month(
       CASE WHEN renewal_dt IS NOT NULL THEN 0 ELSE 1 END AS is_churn
     FROM renewals
     """
-    return con.execute(q).fetchdf()
+
+
+def labels_for_expire_month(
+    con,
+    transactions_csv: Path,
+    expire_month: str,
+    window_days: int = 30,
+    registered: bool = False,
+) -> pd.DataFrame:
+    """
+    Generate churn labels matching Bryan Gregory's labeler_v5.py logic.
+
+    A user is labeled for a target month if:
+    1. They have a transaction with membership_expire_date in target month
+    2. The transaction is NOT a cancellation (is_cancel=0)
+    3. The transaction_date is BEFORE the target month (critical!)
+
+    A user churns if:
+    1. No subsequent transaction within 30 days of expiration, OR
+    2. Subsequent transactions don't extend membership beyond expiration
+
+    NOTE: This function combines both transactions.csv (v1) and transactions_v2.csv
+    to match the winner's approach. The v2 file is a supplement with March 2017 data.
+    With registered=True, `transactions_csv` names a relation registered on `con` and
+    no v1 file lookup is done.
+    """
+    first, last = month_bounds(expire_month)
+    # Target month in YYYYMM format (e.g., 201703 for March 2017)
+    y, m = parse_month(expire_month)
+    target_ym = y * 100 + m
+
+    if registered:
+        return con.execute(
+            _labels_query(f"SELECT * FROM {transactions_csv}", target_ym, window_days)
+        ).fetchdf()
+
+    # Determine paths for both v1 and v2 transaction files
+    tx_csv = Path(transactions_csv)
+    tx_dir = tx_csv.parent
+
+    # Check for v1 file in parent directories
+    v1_candidates = [
+        tx_dir.parent / "transactions.csv",  # kkbox-churn-prediction-challenge/transactions.csv
+        tx_dir / "transactions.csv",
+        tx_dir.parent.parent / "transactions.csv",
+    ]
+    v1_path = None
+    for candidate in v1_candidates:
+        if candidate.exists():
+            v1_path = candidate
+            break
+
+    if tx_csv.suffix == ".parquet":
+        tx_scan = scan_source(tx_csv)
+    else:
+        tx_scan = f"read_csv_auto('{tx_csv}', IGNORE_ERRORS=TRUE)"
+
+    # Build UNION of both transaction files
+    if v1_path and v1_path != tx_csv:
+        tx_union = f"""
+        SELECT * FROM read_csv_auto('{v1_path}', IGNORE_ERRORS=TRUE)
+        UNION ALL
+        SELECT * FROM {tx_scan}
+        """
+    else:
+        tx_union = f"SELECT * FROM {tx_scan}"
+
+    return con.execute(_labels_query(tx_union, target_ym, window_days)).fetchdf()
 
 
 def evaluate_window(
@@ -263,6 +335,8 @@ def get_labels_for_window(
     # For February 2017, try to use official labels
     if target_ym == 201702 and official_labels_path and official_labels_path.exists():
         print(f"  Using official labels from {official_labels_path}")
+        if official_labels_path.suffix == ".parquet":
+            return pd.read_parquet(official_labels_path, columns=["msno", "is_churn"])
         return pd.read_csv(official_labels_path)[["msno", "is_churn"]]
 
     # For March 2017 expirations, we need data through April for renewals
@@ -283,7 +357,7 @@ def main():
     ap.add_argument(
         "--train-placeholder",
         required=True,
-        help="CSV with at least [msno,is_churn]; used only to drive SQL inputs. It may be a copy of train_v2 or a synthetic file containing the msno universe for this run.",
+        help="CSV or Parquet with at least [msno,is_churn]; used only to drive SQL inputs. It may be a copy of train_v2 or a synthetic file containing the msno universe for this run.",
     )
     ap.add_argument("--features-sql", default="features/features_simple.sql")
     ap.add_argument(
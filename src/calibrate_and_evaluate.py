@@ -15,6 +15,7 @@ import pickle
 
 import numpy as np
 import pandas as pd
+import xgboost as xgb
 from sklearn.calibration import IsotonicRegression
 from sklearn.metrics import brier_score_loss, log_loss, roc_auc_score
 from sklearn.preprocessing import LabelEncoder
@@ -93,8 +94,8 @@ def main():
     print("\n2. Loading trained models...")
     with open("models/lightgbm.pkl", "rb") as f:
         lgb_model = pickle.load(f)
-    with open("models/xgboost.pkl", "rb") as f:
-        xgb_model = pickle.load(f)
+    xgb_model = xgb.XGBClassifier()
+    xgb_model.load_model("models/xgb.json")
 
     # Calibrate each model
     print("\n3. Calibrating models...")
@@ -0,0 +1,12 @@
+"""
+Leak-safe feature SQL for KKBOX churn prediction.
+
+FEATURES_SQL holds features/features.sqlx, read once when this module is imported. The
+${train_path}, ${transactions_path}, ${user_logs_path} and ${members_path} placeholders
+are left for the caller to fill in.
+"""
+
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+FEATURES_SQL = (BASE_DIR / "features" / "features.sqlx").read_text()
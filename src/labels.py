@@ -17,8 +17,8 @@ import pandas as pd
 
 
 def create_churn_labels(
-    transactions_path: str,
-    train_labels_path: str,
+    transactions_path: str | pd.DataFrame,
+    train_labels_path: str | pd.DataFrame,
     cutoff_date: str = "2017-03-01",
     window_days: int = 30,
 ) -> pd.DataFrame:
@@ -33,8 +33,8 @@ def create_churn_labels(
     4. Treat is_cancel as "canceled plan," not churn by itself
 
     Args:
-        transactions_path: Path to transactions CSV file
-        train_labels_path: Path to official train labels for validation
+        transactions_path: Path to transactions CSV file, or an in-memory DataFrame
+        train_labels_path: Path to official train labels for validation, or a DataFrame
         cutoff_date: Cutoff date for label generation (YYYY-MM-DD)
         window_days: Days after expiration to check for renewals (default 30)
 
@@ -42,31 +42,40 @@ def create_churn_labels(
         DataFrame with columns: msno, is_churn, last_expire_date, next_txn_date, days_to_next
 
     Raises:
-        FileNotFoundError: If input files don't exist
+        FileNotFoundError: If input file paths don't exist
     """
 
-    if not os.path.exists(transactions_path):
+    tx_in_memory = isinstance(transactions_path, pd.DataFrame)
+    labels_in_memory = isinstance(train_labels_path, pd.DataFrame)
+
+    if not tx_in_memory and not os.path.exists(transactions_path):
         raise FileNotFoundError(f"Transactions file not found: {transactions_path}")
 
-    if not os.path.exists(train_labels_path):
+    if not labels_in_memory and not os.path.exists(train_labels_path):
         raise FileNotFoundError(f"Train labels file not found: {train_labels_path}")
 
     con = duckdb.connect()
 
-    # Load transaction data and official labels
-    con.execute(
-        f"""
-        CREATE OR REPLACE VIEW tx_raw AS
-        SELECT * FROM read_csv_auto('{transactions_path}', IGNORE_ERRORS=TRUE)
-    """
-    )
+    # Load transaction data and official labels (DataFrames are registered without a CSV trip)
+    if tx_in_memory:
+        con.register("tx_raw", transactions_path)
+    else:
+        con.execute(
+            f"""
+            CREATE OR REPLACE VIEW tx_raw AS
+            SELECT * FROM read_csv_auto('{transactions_path}', IGNORE_ERRORS=TRUE)
+        """
+        )
 
-    con.execute(
-        f"""
-        CREATE OR REPLACE VIEW official_labels AS
-        SELECT * FROM read_csv_auto('{train_labels_path}', IGNORE_ERRORS=TRUE)
-    """
-    )
+    if labels_in_memory:
+        con.register("official_labels", train_labels_path)
+    else:
+        con.execute(
+            f"""
+            CREATE OR REPLACE VIEW official_labels AS
+            SELECT * FROM read_csv_auto('{train_labels_path}', IGNORE_ERRORS=TRUE)
+        """
+        )
 
     # Implement WSDMChurnLabeller.scala logic exactly
     query = f"""
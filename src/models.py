@@ -349,20 +349,22 @@ class ModelTrainer:
 
 
 def run_training_pipeline(
-    features_path: str,
+    features_path: str | None = None,
     output_dir: str = "models",
     use_temporal_split: bool = True,
     train_cutoff: str = "2017-02-01",
+    features_df: pd.DataFrame | None = None,
 ) -> dict[str, Any]:
     """
     Execute complete model training pipeline.
 
     Args:
-        features_path: Path to processed features CSV
+        features_path: Path to processed features (CSV or Parquet)
         output_dir: Directory to save models and results
         use_temporal_split: If True, use time-based train/val split (recommended).
                            If False, use random stratified split.
         train_cutoff: Date cutoff for temporal split (training uses data before this date)
+        features_df: Already-loaded features; used instead of reading features_path
 
     Returns:
         comprehensive_metrics: All model performance metrics
@@ -370,8 +372,16 @@ def run_training_pipeline(
     print("Starting KKBOX Churn Model Training Pipeline")
 
     # Load features
-    print(f"Loading features from {features_path}")
-    df = pd.read_csv(features_path)
+    if features_df is not None:
+        df = features_df
+    elif features_path is None:
+        raise ValueError("Either features_path or features_df must be provided")
+    else:
+        print(f"Loading features from {features_path}")
+        if Path(features_path).suffix == ".parquet":
+            df = pd.read_parquet(features_path)
+        else:
+            df = pd.read_csv(features_path)
 
     # Validate temporal safety
     print(f"Validating data: {len(df)} samples, {df['is_churn'].mean():.3f} churn rate")
@@ -24,11 +24,23 @@ def psi_expected(actual: np.ndarray, expected: np.ndarray, bins: int = 10) -> fl
     return float(np.sum((a - e) * np.log(a / e)))
 
 
-def psi_numeric(a: np.ndarray, e: np.ndarray, bins: int = 10) -> float:
+def reference_bins(e: np.ndarray, bins: int = 10) -> tuple[np.ndarray, np.ndarray]:
+    """Quantile bin edges of the reference sample and its per-bin fractions."""
     qs = np.linspace(0, 1, bins + 1)
     edges = np.quantile(e, qs)
+    e_frac = np.histogram(e, bins=edges, density=False)[0] / max(1, len(e))
+    return edges, e_frac
+
+
+def psi_numeric(
+    a: np.ndarray,
+    e: np.ndarray,
+    bins: int = 10,
+    ref: tuple[np.ndarray, np.ndarray] | None = None,
+) -> float:
+    # ref: precomputed reference_bins(e, bins), reused when comparing many windows to one reference
+    edges, e = ref if ref is not None else reference_bins(e, bins)
     a = np.histogram(a, bins=edges, density=False)[0] / max(1, len(a))
-    e = np.histogram(e, bins=edges, density=False)[0] / max(1, len(e))
     a = np.clip(a, 1e-6, None)
     e = np.clip(e, 1e-6, None)
     return float(np.sum((a - e) * np.log(a / e)))
@@ -69,6 +81,7 @@ def main() -> None:
 
     rows = []
     ref_df = df[df["window"] == ref_window]
+    ref_bins = {}  # feature -> reference_bins(), computed once and reused for every window
 
     for w in windows:
         if w == ref_window:
@@ -90,7 +103,9 @@ def main() -> None:
                 e = e[~np.isnan(e)]
                 if len(a) == 0 or len(e) == 0:
                     continue
-                val = psi_numeric(a, e, bins=10)
+                if c not in ref_bins:
+                    ref_bins[c] = reference_bins(e, bins=10)
+                val = psi_numeric(a, e, bins=10, ref=ref_bins[c])
             else:
                 # Convert to frequency vectors
                 va, ea = pd.value_counts(pd.Series(a)), pd.value_counts(pd.Series(e))
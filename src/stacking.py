@@ -97,7 +97,9 @@ class StackedEnsemble:
 
     def fit(self, X: np.ndarray, y: np.ndarray, feature_names: list = None):
         """Train stacked ensemble with out-of-fold predictions."""
-        scale_pos_weight = (y == 0).sum() / (y == 1).sum()
+        # Single counting pass over the labels instead of two boolean scans
+        counts = np.bincount(y.astype(np.int8, copy=False), minlength=2)
+        scale_pos_weight = counts[0] / max(counts[1], 1)
         xgb_params, lgb_params, cat_params = self._get_base_model_params(scale_pos_weight)
 
         n_samples = len(y)
@@ -102,6 +102,7 @@ class ChurnTemporalCV:
         self.months = sorted(months)
         self.time_column = time_column
         self.expanding = expanding
+        self._fold_descriptions = self._build_fold_descriptions()
 
     def get_n_splits(self) -> int:
         """Return number of CV folds."""
@@ -149,19 +150,27 @@ class ChurnTemporalCV:
 
             yield train_idx, val_idx
 
-    def get_fold_description(self) -> list[str]:
-        """Return human-readable descriptions of each fold."""
+    def _build_fold_descriptions(self) -> list[str]:
+        """Build fold descriptions once; months are fixed after construction."""
         descriptions = []
+        train_desc = ""
         for i in range(1, len(self.months)):
             if self.expanding:
-                train_months = self.months[:i]
-                train_desc = "+".join(train_months)
+                # Extend the running "+"-joined prefix instead of re-joining each fold
+                train_desc = f"{train_desc}+{self.months[i - 1]}" if train_desc else self.months[0]
             else:
                 train_desc = self.months[i - 1]
-            val_desc = self.months[i]
-            descriptions.append(f"Train: {train_desc}, Val: {val_desc}")
+            descriptions.append(f"Train: {train_desc}, Val: {self.months[i]}")
         return descriptions
 
+    def get_fold_description(self) -> list[str]:
+        """Return human-readable descriptions of each fold."""
+        return list(self._fold_descriptions)
+
+
+# Byte budget for one block of bootstrap indices: half of a typical 1 MiB L2 cache
+BOOTSTRAP_TILE_BYTES = 512 * 1024
+
 
 class BootstrapMetrics:
     """
@@ -221,32 +230,38 @@ class BootstrapMetrics:
         if len(np.unique(y_true)) < 2:
             raise ValueError("y_true must contain at least 2 classes")
 
-        np.random.seed(self.random_state)
+        rng = np.random.default_rng(self.random_state)
 
         n_samples = len(y_true)
 
-        # Storage for bootstrap samples
-        metrics = {"log_loss": [], "auc": [], "brier": []}
+        # Preallocated per-replicate storage; NaN marks skipped single-class resamples
+        metrics = {name: np.full(self.n_bootstrap, np.nan) for name in ("log_loss", "auc", "brier")}
 
-        for _ in range(self.n_bootstrap):
-            # Resample with replacement
-            idx = np.random.choice(n_samples, size=n_samples, replace=True)
-            y_true_boot = y_true[idx]
-            y_pred_boot = y_pred[idx]
+        # Draw resample indices in blocks of `tile` rows sized so tile * n * 4 bytes fits the
+        # half-L2 budget; large inputs fall back to one row per draw, so index memory never
+        # exceeds max(budget, one resample) regardless of n_bootstrap
+        tile = max(1, BOOTSTRAP_TILE_BYTES // (n_samples * np.dtype(np.int32).itemsize))
+        for b0 in range(0, self.n_bootstrap, tile):
+            block = rng.integers(
+                0, n_samples, (min(tile, self.n_bootstrap - b0), n_samples), dtype=np.int32
+            )
+            for offset, idx in enumerate(block):
+                y_true_boot = y_true[idx]
+                y_pred_boot = y_pred[idx]
 
-            # Skip if only one class in bootstrap sample
-            if len(np.unique(y_true_boot)) < 2:
-                continue
+                # Skip if only one class in bootstrap sample
+                if len(np.unique(y_true_boot)) < 2:
+                    continue
 
-            # Compute metrics
-            metrics["log_loss"].append(log_loss(y_true_boot, y_pred_boot))
-            metrics["auc"].append(roc_auc_score(y_true_boot, y_pred_boot))
-            metrics["brier"].append(brier_score_loss(y_true_boot, y_pred_boot))
+                b = b0 + offset
+                metrics["log_loss"][b] = log_loss(y_true_boot, y_pred_boot)
+                metrics["auc"][b] = roc_auc_score(y_true_boot, y_pred_boot)
+                metrics["brier"][b] = brier_score_loss(y_true_boot, y_pred_boot)
 
         # Compute confidence intervals
         results = {}
         for metric_name, values in metrics.items():
-            values = np.array(values)
+            values = values[~np.isnan(values)]
             results[metric_name] = {
                 "mean": np.mean(values),
                 "std": np.std(values),
@@ -305,6 +320,9 @@ def temporal_cross_val_score(
 
     fold_descriptions = cv.get_fold_description()
 
+    # Raw numpy view of the target so per-fold churn rates skip pandas overhead
+    y_np = y.to_numpy(np.int8, copy=False)
+
     for fold_idx, (train_idx, val_idx) in enumerate(cv.split(X)):
         # Clone estimator for this fold
         model = clone(estimator)
@@ -341,8 +359,8 @@ def temporal_cross_val_score(
                 "description": fold_descriptions[fold_idx],
                 "n_train": len(train_idx),
                 "n_val": len(val_idx),
-                "train_churn_rate": y_train.mean(),
-                "val_churn_rate": y_val.mean(),
+                "train_churn_rate": float(y_np[train_idx].mean()),
+                "val_churn_rate": float(y_np[val_idx].mean()),
                 "score": score,
             }
         )
@@ -2,160 +2,155 @@
 """
 Integration test for the complete KKBOX pipeline.
 Tests synthetic data flow through all components.
+
+Run with: pytest test_integration.py
 """
 
-import sys
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 
-def test_synthetic_backtest():
+def test_synthetic_backtest(synthetic_duckdb):
     """Test backtest functionality with synthetic data."""
-    print("🧪 Testing synthetic backtest pipeline...")
-
-    # Use synthetic data for testing
-    try:
-        import duckdb
-
-        from src.backtest import build_features, labels_for_expire_month
-
-        # Test with synthetic data paths
-        syn_path = Path("tests/fixtures")
-        con = duckdb.connect()
-
-        print("  ✅ Backtest imports successful")
-
-        # Test feature building
-        features = build_features(
-            con,
-            sql_path=Path("features/features_simple.sql"),
-            cutoff=pd.Timestamp("2017-02-28").date(),
-            train_path=syn_path / "train_synthetic.csv",
-            transactions_path=syn_path / "transactions_synthetic.csv",
-            user_logs_path=syn_path / "user_logs_synthetic.csv",
-            members_path=syn_path / "members_synthetic.csv",
-        )
-        print(f"  ✅ Features built: {len(features)} rows")
-
-        # Test label building
-        labels = labels_for_expire_month(con, syn_path / "transactions_synthetic.csv", "2017-02")
-        print(f"  ✅ Labels built: {len(labels)} rows, churn rate: {labels['is_churn'].mean():.3f}")
-
-        return True
-
-    except Exception as e:
-        print(f"  ❌ Backtest test failed: {e}")
-        return False
-
-
-def test_psi():
+    from src.backtest import build_features, labels_for_expire_month
+    from tests.fixtures.generate_synthetic import SYNTHETIC_VIEWS
+
+    # Synthetic tables are registered on the connection as in-memory views
+    con = synthetic_duckdb
+
+    features = build_features(
+        con,
+        sql_path=Path("features/features_simple.sql"),
+        cutoff=pd.Timestamp("2017-02-28").date(),
+        train_path=SYNTHETIC_VIEWS["train"],
+        transactions_path=SYNTHETIC_VIEWS["transactions"],
+        user_logs_path=SYNTHETIC_VIEWS["user_logs"],
+        members_path=SYNTHETIC_VIEWS["members"],
+        registered=True,
+    )
+    assert len(features) > 0
+
+    labels = labels_for_expire_month(
+        con, SYNTHETIC_VIEWS["transactions"], "2017-02", registered=True
+    )
+    assert len(labels) > 0
+    assert labels["is_churn"].isin([0, 1]).all()
+
+
+def test_feature_sql_compiled_once_per_sources(synthetic_duckdb):
+    """Successive cutoffs reuse the compiled feature SQL and only re-bind the cutoff."""
+    from src.backtest import build_features, compile_feature_sql
+    from tests.fixtures.generate_synthetic import SYNTHETIC_VIEWS
+
+    sources = dict(
+        sql_path=Path("features/features_simple.sql"),
+        train_path=SYNTHETIC_VIEWS["train"],
+        transactions_path=SYNTHETIC_VIEWS["transactions"],
+        user_logs_path=SYNTHETIC_VIEWS["user_logs"],
+        members_path=SYNTHETIC_VIEWS["members"],
+        registered=True,
+    )
+    jan = build_features(synthetic_duckdb, cutoff=pd.Timestamp("2017-01-31").date(), **sources)
+    hits = compile_feature_sql.cache_info().hits
+    feb = build_features(synthetic_duckdb, cutoff=pd.Timestamp("2017-02-28").date(), **sources)
+
+    assert compile_feature_sql.cache_info().hits == hits + 1
+    assert len(jan) == len(feb) > 0
+    assert (jan["cutoff_ts"] != feb["cutoff_ts"]).all()
+
+
+def test_synthetic_backtest_parquet(synthetic_fixture_dir: Path, duckdb_con):
+    """Features and labels build from Parquet fixture files via read_parquet."""
+    from src.backtest import build_features, get_labels_for_window, labels_for_expire_month
+
+    con = duckdb_con
+    features = build_features(
+        con,
+        sql_path=Path("features/features_simple.sql"),
+        cutoff=pd.Timestamp("2017-02-28").date(),
+        train_path=synthetic_fixture_dir / "train_synthetic.parquet",
+        transactions_path=synthetic_fixture_dir / "transactions_synthetic.parquet",
+        user_logs_path=synthetic_fixture_dir / "user_logs_synthetic.parquet",
+        members_path=synthetic_fixture_dir / "members_synthetic.parquet",
+    )
+    assert len(features) == 1000
+    assert {"msno", "is_churn", "tx_count_total", "logs_30d"}.issubset(features.columns)
+
+    labels = labels_for_expire_month(
+        con, synthetic_fixture_dir / "transactions_synthetic.parquet", "2017-03"
+    )
+    assert set(labels.columns) == {"msno", "is_churn"}
+    assert labels["is_churn"].isin([0, 1]).all()
+
+    # Feb 2017 prefers the official labels file, here read back from Parquet
+    official = get_labels_for_window(
+        con,
+        synthetic_fixture_dir / "transactions_synthetic.parquet",
+        "2017-02",
+        synthetic_fixture_dir / "train_synthetic.parquet",
+    )
+    assert list(official.columns) == ["msno", "is_churn"]
+    assert len(official) == 1000
+
+
+def _psi_samples():
+    """Seeded reference/shifted normal samples for the PSI test."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    a = rng.normal(0, 1, 1000)
+    b = rng.normal(0.1, 1.2, 1000)  # Slightly different distribution
+    return a, b
+
+
+@pytest.fixture(scope="session")
+def psi_samples():
+    """PSI input samples, drawn once per test session."""
+    return _psi_samples()
+
+
+def test_psi(psi_samples):
     """Test PSI calculation."""
-    print("🧪 Testing PSI calculation...")
+    import numpy as np
 
-    try:
-        import numpy as np
+    from src.psi import psi_numeric, reference_bins
 
-        from src.psi import psi_numeric
+    # Test PSI calculation with simple data
+    a, b = psi_samples
 
-        # Test PSI calculation with simple data
-        a = np.random.normal(0, 1, 1000)
-        b = np.random.normal(0.1, 1.2, 1000)  # Slightly different distribution
+    psi_val = psi_numeric(a, b, bins=10)
+    assert np.isfinite(psi_val) and psi_val >= 0
 
-        psi_val = psi_numeric(a, b, bins=10)
-        print(f"  ✅ PSI calculation: {psi_val:.4f}")
+    # PSI must match a hand-computed np.histogram reference
+    edges = np.quantile(b, np.linspace(0, 1, 11))
+    ha = np.clip(np.histogram(a, bins=edges)[0] / len(a), 1e-6, None)
+    hb = np.clip(np.histogram(b, bins=edges)[0] / len(b), 1e-6, None)
+    assert abs(psi_val - np.sum((ha - hb) * np.log(ha / hb))) < 1e-12
 
-        return True
-
-    except Exception as e:
-        print(f"  ❌ PSI test failed: {e}")
-        return False
+    # Precomputed reference bins (batch path in src/psi.py main) give the same value
+    assert psi_numeric(a, b, bins=10, ref=reference_bins(b, bins=10)) == psi_val
 
 
 def test_models_exist():
     """Check that trained models exist."""
-    print("🧪 Testing model availability...")
-
     models_dir = Path("models")
     expected_models = ["xgboost.pkl", "random_forest.pkl", "logistic_regression.pkl"]
 
-    found_models = []
-    for model_file in expected_models:
-        if (models_dir / model_file).exists():
-            found_models.append(model_file)
-            print(f"  ✅ Found: {model_file}")
-        else:
-            print(f"  ⚠️  Missing: {model_file}")
-
-    return len(found_models) > 0
+    found_models = [m for m in expected_models if (models_dir / m).exists()]
+    if not found_models:
+        pytest.skip(f"no trained models in {models_dir}/")
 
 
 def test_app_features():
     """Check that app features are available."""
-    print("🧪 Testing app features...")
-
     app_features_path = Path("eval/app_features.csv")
-    if app_features_path.exists():
-        df = pd.read_csv(app_features_path)
-        print(f"  ✅ App features: {len(df)} rows, {df.shape[1]} columns")
-
-        # Check required columns
-        required_cols = ["msno"]
-        missing_cols = [col for col in required_cols if col not in df.columns]
-
-        if missing_cols:
-            print(f"  ⚠️  Missing columns: {missing_cols}")
-            return False
-        else:
-            print("  ✅ All required columns present")
-            return True
-    else:
-        print(f"  ❌ App features not found at {app_features_path}")
-        return False
-
-
-def main():
-    """Run all integration tests."""
-    print("🎵 KKBOX Integration Test Suite")
-    print("=" * 50)
-
-    tests = [
-        ("Synthetic Backtest", test_synthetic_backtest),
-        ("PSI Calculation", test_psi),
-        ("Model Availability", test_models_exist),
-        ("App Features", test_app_features),
-    ]
-
-    results = []
-    for test_name, test_func in tests:
-        print(f"\n🔄 {test_name}")
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"  ❌ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
-
-    print("\n📊 INTEGRATION TEST RESULTS")
-    print("=" * 50)
-
-    passed = 0
-    for test_name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{test_name:<20s}: {status}")
-        if result:
-            passed += 1
-
-    print(f"\nOverall: {passed}/{len(results)} tests passed")
-
-    if passed == len(results):
-        print("\n🎉 All integration tests passed! Pipeline ready for real data.")
-    else:
-        print(f"\n⚠️  {len(results) - passed} tests failed. Check errors above.")
-
-    return passed == len(results)
-
-
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    assert app_features_path.exists(), f"App features not found at {app_features_path}"
+
+    df = pd.read_csv(app_features_path)
+    assert len(df) > 0
+
+    # Check required columns
+    required_cols = {"msno"}
+    assert required_cols.issubset(df.columns)
@@ -0,0 +1,34 @@
+"""Shared fixtures for API integration tests."""
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient shared across the session; startup events run once."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+async def async_client(client):
+    """In-process async client for issuing independent requests concurrently.
+
+    Depends on ``client`` so the app's startup loading has already run.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture(scope="session")
+def valid_msno(client):
+    """A member id known to the API; skips dependent tests if no members are loaded."""
+    members = client.get("/api/members?limit=1").json().get("members", [])
+    if not members:
+        pytest.skip("no members loaded")
+    return members[0]["msno"]
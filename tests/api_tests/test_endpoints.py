@@ -6,7 +6,10 @@ Tests all endpoints with real data to ensure correct functionality.
 Run with: pytest tests/api_tests/test_endpoints.py -v
 """
 
+import asyncio
+import statistics
 import sys
+import time
 from pathlib import Path
 
 # Ensure project root is in path before any imports
@@ -15,82 +18,91 @@ if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
 import pytest  # noqa: E402
-from fastapi.testclient import TestClient  # noqa: E402
 
-from api.main import app  # noqa: E402
+INDEPENDENT_GET_URLS = [
+    "/",
+    "/api/health",
+    "/api/members",
+    "/api/metrics",
+    "/api/calibration",
+    "/api/features/importance",
+]
 
-client = TestClient(app)
 
+async def test_independent_endpoints_return_200(async_client):
+    """Read-only endpoints should all return 200 OK (requests issued concurrently)."""
+    responses = await asyncio.gather(*[async_client.get(url) for url in INDEPENDENT_GET_URLS])
+    for url, response in zip(INDEPENDENT_GET_URLS, responses):
+        assert response.status_code == 200, url
 
-class TestHealthEndpoint:
-    """Tests for /api/health endpoint."""
 
-    def test_health_check_returns_200(self):
-        """Health check should return 200 OK."""
-        response = client.get("/api/health")
-        assert response.status_code == 200
+def _check_health(data):
+    assert data["status"] == "healthy"
+    # Model and features may or may not be loaded in test environment
+    assert isinstance(data["model_loaded"], bool)
+    assert isinstance(data["features_loaded"], bool)
 
-    def test_health_check_response_structure(self):
-        """Health check should return correct structure."""
-        response = client.get("/api/health")
-        data = response.json()
 
-        assert "status" in data
-        assert "model_loaded" in data
-        assert "features_loaded" in data
-        assert data["status"] == "healthy"
+def _check_members_default(data):
+    assert isinstance(data["members"], list)
+    assert len(data["members"]) <= 100  # Default limit
 
-    def test_health_check_model_status(self):
-        """Model status should be reported."""
-        response = client.get("/api/health")
-        data = response.json()
-        # Model may or may not be loaded in test environment
-        assert isinstance(data["model_loaded"], bool)
 
-    def test_health_check_features_status(self):
-        """Features status should be reported."""
-        response = client.get("/api/health")
-        data = response.json()
-        # Features may or may not be loaded in test environment
-        assert isinstance(data["features_loaded"], bool)
+def _check_feature_importance(data):
+    assert isinstance(data["features"], list)
+    assert len(data["features"]) <= 10
 
+    if data["features"]:
+        assert {"name", "importance"}.issubset(data["features"][0])
+        importances = [f["importance"] for f in data["features"]]
+        assert importances == sorted(importances, reverse=True)
 
-class TestMembersEndpoint:
-    """Tests for /api/members endpoint."""
 
-    def test_members_list_returns_200(self):
-        """Members list should return 200 OK."""
-        response = client.get("/api/members")
-        assert response.status_code == 200
+def _check_metrics(data):
+    # Common metric fields
+    possible_fields = ["auc", "log_loss", "brier_score", "accuracy", "roc_auc"]
+    has_metrics = any(field in str(data).lower() for field in possible_fields)
+    assert has_metrics or len(data) > 0
 
-    def test_members_list_response_structure(self):
-        """Members list should return correct structure."""
-        response = client.get("/api/members")
-        data = response.json()
 
-        assert "members" in data
-        assert "total" in data
-        assert "limit" in data
-        assert "offset" in data
-        assert isinstance(data["members"], list)
+@pytest.mark.parametrize(
+    "url,required,check",
+    [
+        ("/api/health", {"status", "model_loaded", "features_loaded"}, _check_health),
+        ("/api/members", {"members", "total", "limit", "offset"}, _check_members_default),
+        ("/api/features/importance?top_n=10", {"features"}, _check_feature_importance),
+        ("/api/metrics", set(), _check_metrics),
+        ("/api/calibration", set(), None),
+    ],
+)
+def test_get_response_keys(client, url, required, check):
+    """JSON endpoints should return 200 with an object holding the expected keys and values."""
+    response = client.get(url)
+    assert response.status_code == 200
 
-    def test_members_list_pagination(self):
-        """Members list should respect pagination parameters."""
-        response = client.get("/api/members?limit=5&offset=0")
-        data = response.json()
+    data = response.json()
+    assert isinstance(data, dict)
+    assert required.issubset(data)
+
+    if check is not None:
+        check(data)
+
+
+class TestMembersEndpoint:
+    """Tests for /api/members endpoint."""
+
+    def test_members_list_pagination(self, client):
+        """Members list should respect pagination and return required member fields."""
+        data = client.get("/api/members?limit=5&offset=0").json()
 
         assert len(data["members"]) <= 5
         assert data["limit"] == 5
         assert data["offset"] == 0
 
-    def test_members_list_default_limit(self):
-        """Members list should have a default limit."""
-        response = client.get("/api/members")
-        data = response.json()
-
-        assert len(data["members"]) <= 100  # Default limit
+        if data["members"]:
+            assert {"msno", "risk_score", "risk_tier"}.issubset(data["members"][0])
 
-    def test_members_search_by_risk(self):
+    def test_members_search_by_risk(self, client):
         """Members list should filter by risk tier."""
         response = client.get("/api/members?risk_tier=High")
         data = response.json()
@@ -100,211 +112,87 @@ class TestMembersEndpoint:
             for member in data["members"]:
                 assert member["risk_tier"] == "High"
 
-    def test_members_list_contains_required_fields(self):
-        """Each member should have required fields."""
-        response = client.get("/api/members?limit=5")
-        data = response.json()
-
-        if data["members"]:
-            member = data["members"][0]
-            assert "msno" in member
-            assert "risk_score" in member
-            assert "risk_tier" in member
-
 
 class TestMemberDetailEndpoint:
     """Tests for /api/members/{msno} endpoint."""
 
-    def test_member_detail_valid_msno(self):
+    def test_member_detail_valid_msno(self, client, valid_msno):
         """Should return member details for valid msno."""
-        # First get a valid msno from the list
-        list_response = client.get("/api/members?limit=1")
-        members = list_response.json()["members"]
-
-        if members:
-            msno = members[0]["msno"]
-            response = client.get(f"/api/members/{msno}")
-            assert response.status_code == 200
+        response = client.get(f"/api/members/{valid_msno}")
+        assert response.status_code == 200
 
-            data = response.json()
-            assert data["msno"] == msno
-            assert "risk_score" in data
-            assert "risk_tier" in data
+        data = response.json()
+        assert data["msno"] == valid_msno
+        assert "risk_score" in data
+        assert "risk_tier" in data
 
-    def test_member_detail_invalid_msno(self):
+    def test_member_detail_invalid_msno(self, client):
         """Should return 404 for invalid msno."""
         response = client.get("/api/members/invalid_msno_12345")
         assert response.status_code == 404
 
-    def test_member_detail_contains_features(self):
+    def test_member_detail_contains_features(self, client, valid_msno):
         """Member detail should include feature data."""
-        list_response = client.get("/api/members?limit=1")
-        members = list_response.json()["members"]
-
-        if members:
-            msno = members[0]["msno"]
-            response = client.get(f"/api/members/{msno}")
-            data = response.json()
+        response = client.get(f"/api/members/{valid_msno}")
+        data = response.json()
 
-            # Should have some feature data
-            assert "features" in data or len(data) > 3
+        # Should have some feature data
+        assert "features" in data or len(data) > 3
 
 
 class TestPredictionsEndpoint:
     """Tests for /api/predictions endpoints."""
 
-    def test_single_prediction_valid_msno(self):
+    def test_single_prediction_valid_msno(self, client, valid_msno):
         """Should return prediction for valid msno."""
-        # Get a valid msno first
-        list_response = client.get("/api/members?limit=1")
-        members = list_response.json()["members"]
-
-        if members:
-            msno = members[0]["msno"]
-            response = client.post("/api/predictions/single", json={"msno": msno})
-            assert response.status_code == 200
+        response = client.post("/api/predictions/single", json={"msno": valid_msno})
+        assert response.status_code == 200
 
-            data = response.json()
-            assert "churn_probability" in data
-            assert "risk_tier" in data
-            assert 0 <= data["churn_probability"] <= 1
+        data = response.json()
+        assert "churn_probability" in data
+        assert "risk_tier" in data
+        assert 0 <= data["churn_probability"] <= 1
 
-    def test_single_prediction_invalid_msno(self):
+    def test_single_prediction_invalid_msno(self, client):
         """Should return 404 for invalid msno."""
         response = client.post("/api/predictions/single", json={"msno": "invalid_msno_xyz"})
         assert response.status_code == 404
 
-    def test_batch_prediction(self):
-        """Should return batch predictions."""
-        # Get some valid msnos
-        list_response = client.get("/api/members?limit=5")
-        members = list_response.json()["members"]
-
-        if len(members) >= 2:
-            msnos = [m["msno"] for m in members[:3]]
-            response = client.post("/api/predictions", json={"msnos": msnos})
-            assert response.status_code == 200
-
-            data = response.json()
-            assert "predictions" in data
-            assert "total_requested" in data
-            assert "total_found" in data
-            assert data["total_requested"] == len(msnos)
-
-    def test_batch_prediction_with_invalid_msnos(self):
-        """Batch prediction should handle mix of valid/invalid msnos."""
-        # Get a valid msno
-        list_response = client.get("/api/members?limit=1")
-        members = list_response.json()["members"]
-
-        if members:
-            msnos = [members[0]["msno"], "invalid_msno_abc"]
-            response = client.post("/api/predictions", json={"msnos": msnos})
-            assert response.status_code == 200
-
-            data = response.json()
-            assert data["total_requested"] == 2
-            assert data["total_found"] >= 1  # At least one should be found
-
-    def test_batch_prediction_empty_list(self):
-        """Batch prediction should handle empty list."""
-        response = client.post("/api/predictions", json={"msnos": []})
-        # Should either return 200 with empty results or 422 validation error
-        assert response.status_code in [200, 422]
-
-
-class TestMetricsEndpoint:
-    """Tests for /api/metrics endpoint."""
-
-    def test_metrics_returns_200(self):
-        """Metrics endpoint should return 200 OK."""
-        response = client.get("/api/metrics")
-        assert response.status_code == 200
 
-    def test_metrics_response_structure(self):
-        """Metrics should contain model performance data."""
-        response = client.get("/api/metrics")
-        data = response.json()
+async def test_batch_prediction_matrix(async_client, valid_msno):
+    """Batch predictions for mixed, all-valid and empty requests, issued concurrently."""
+    mixed, valid, empty = await asyncio.gather(
+        async_client.post("/api/predictions", json={"msnos": [valid_msno, "invalid_msno_abc"]}),
+        async_client.post("/api/predictions", json={"msnos": [valid_msno] * 3}),
+        async_client.post("/api/predictions", json={"msnos": []}),
+    )
 
-        # Should have some performance metrics
-        assert isinstance(data, dict)
-        # Common metric fields
-        possible_fields = ["auc", "log_loss", "brier_score", "accuracy", "roc_auc"]
-        has_metrics = any(field in str(data).lower() for field in possible_fields)
-        assert has_metrics or len(data) > 0
+    # Mix of valid/invalid msnos
+    assert mixed.status_code == 200
+    data = mixed.json()
+    assert data["total_requested"] == 2
+    assert data["total_found"] >= 1  # At least one should be found
 
+    assert valid.status_code == 200
+    data = valid.json()
+    assert {"predictions", "total_requested", "total_found"}.issubset(data)
+    assert data["total_requested"] == 3
 
-class TestCalibrationEndpoint:
-    """Tests for /api/calibration endpoint."""
-
-    def test_calibration_returns_200(self):
-        """Calibration endpoint should return 200 OK."""
-        response = client.get("/api/calibration")
-        assert response.status_code == 200
-
-    def test_calibration_response_structure(self):
-        """Calibration should return curve data."""
-        response = client.get("/api/calibration")
-        data = response.json()
-
-        assert isinstance(data, dict)
-
-
-class TestFeatureImportanceEndpoint:
-    """Tests for /api/features/importance endpoint."""
-
-    def test_feature_importance_returns_200(self):
-        """Feature importance endpoint should return 200 OK."""
-        response = client.get("/api/features/importance")
-        assert response.status_code == 200
-
-    def test_feature_importance_response_structure(self):
-        """Feature importance should return ranked features."""
-        response = client.get("/api/features/importance")
-        data = response.json()
-
-        assert "features" in data
-        assert isinstance(data["features"], list)
-
-        if data["features"]:
-            feature = data["features"][0]
-            assert "name" in feature
-            assert "importance" in feature
-
-    def test_feature_importance_top_n(self):
-        """Feature importance should respect top_n parameter."""
-        response = client.get("/api/features/importance?top_n=10")
-        data = response.json()
-
-        assert len(data["features"]) <= 10
-
-    def test_feature_importance_sorted(self):
-        """Features should be sorted by importance (descending)."""
-        response = client.get("/api/features/importance?top_n=20")
-        data = response.json()
-
-        if len(data["features"]) >= 2:
-            importances = [f["importance"] for f in data["features"]]
-            assert importances == sorted(importances, reverse=True)
+    # Should either return 200 with empty results or 422 validation error
+    assert empty.status_code in [200, 422]
 
 
 class TestShapEndpoint:
     """Tests for /api/shap endpoint."""
 
-    def test_shap_valid_msno(self):
+    def test_shap_valid_msno(self, client, valid_msno):
         """Should return SHAP values for valid msno."""
-        # Get a valid msno first
-        list_response = client.get("/api/members?limit=1")
-        members = list_response.json()["members"]
+        response = client.get(f"/api/shap/{valid_msno}")
 
-        if members:
-            msno = members[0]["msno"]
-            response = client.get(f"/api/shap/{msno}")
+        # SHAP computation might be slow or not available
+        assert response.status_code in [200, 404, 500, 503]
 
-            # SHAP computation might be slow or not available
-            assert response.status_code in [200, 404, 500, 503]
-
-    def test_shap_invalid_msno(self):
+    def test_shap_invalid_msno(self, client):
         """Should return 404 for invalid msno."""
         response = client.get("/api/shap/invalid_msno_xyz")
         assert response.status_code in [404, 500]
@@ -313,12 +201,7 @@ class TestShapEndpoint:
 class TestRootEndpoint:
     """Tests for root endpoint."""
 
-    def test_root_returns_200(self):
-        """Root endpoint should return 200."""
-        response = client.get("/")
-        assert response.status_code == 200
-
-    def test_root_returns_content(self):
+    def test_root_returns_content(self, client):
         """Root should return either API info or frontend HTML."""
         response = client.get("/")
         # Could be JSON API info or HTML frontend
@@ -326,48 +209,40 @@ class TestRootEndpoint:
         assert "json" in content_type or "html" in content_type
 
 
-class TestAPIPerformance:
-    """Performance tests for API endpoints."""
-
-    def test_health_check_fast(self):
-        """Health check should respond quickly."""
-        import time
-
-        start = time.time()
-        response = client.get("/api/health")
-        elapsed = time.time() - start
-
+def _median_latency(call, n=10):
+    """Median wall time of ``n`` calls, measured with the monotonic perf_counter."""
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = call()
+        times.append(time.perf_counter() - start)
         assert response.status_code == 200
-        assert elapsed < 1.0  # Should respond in under 1 second
-
-    def test_members_list_fast(self):
-        """Members list should respond reasonably fast."""
-        import time
-
-        start = time.time()
-        response = client.get("/api/members?limit=10")
-        elapsed = time.time() - start
+    return statistics.median(times)
 
-        assert response.status_code == 200
-        assert elapsed < 2.0  # Should respond in under 2 seconds
 
-    def test_single_prediction_fast(self):
-        """Single prediction should be fast (O(1) lookup)."""
-        import time
+@pytest.fixture(scope="module")
+def warm_predict(client, valid_msno):
+    """Issue one prediction so cold-start cost is excluded from latency checks."""
+    client.post("/api/predictions/single", json={"msno": valid_msno})
 
-        # Get a valid msno first
-        list_response = client.get("/api/members?limit=1")
-        members = list_response.json()["members"]
 
-        if members:
-            msno = members[0]["msno"]
+class TestAPIPerformance:
+    """Steady-state latency tests for API endpoints (the session client has already started up)."""
 
-            start = time.time()
-            response = client.post("/api/predictions/single", json={"msno": msno})
-            elapsed = time.time() - start
+    def test_health_check_fast(self, client):
+        """Health check should respond quickly."""
+        assert _median_latency(lambda: client.get("/api/health")) < 1.0
 
-            assert response.status_code == 200
-            assert elapsed < 0.5  # Should respond in under 500ms
+    def test_members_list_fast(self, client):
+        """Members list should respond reasonably fast."""
+        assert _median_latency(lambda: client.get("/api/members?limit=10")) < 2.0
+
+    def test_single_prediction_fast(self, client, valid_msno, warm_predict):
+        """Warmed single prediction should be fast (O(1) lookup)."""
+        elapsed = _median_latency(
+            lambda: client.post("/api/predictions/single", json={"msno": valid_msno})
+        )
+        assert elapsed < 0.05  # Median under 50ms
 
 
 if __name__ == "__main__":
@@ -4,9 +4,148 @@ import os
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import pytest
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Modules under src/ are also imported top-level (e.g. ``from labels import ...``)
+src_dir = str(project_root / "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
 # Change working directory to project root for data file access
 os.chdir(project_root)
+
+
+# Shared churn-label inputs (tests/test_labels.py); built and written to CSV once per session
+@pytest.fixture(scope="session")
+def sample_transactions():
+    """Create sample transaction data for testing."""
+    data = [
+        # User 1: Churns - expires 2017-02-15, no renewal within 30 days
+        {
+            "msno": "user1",
+            "membership_expire_date": "20170215",
+            "transaction_date": "20170101",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        # User 2: Renews - expires 2017-02-15, renews on 2017-02-20 (5 days later)
+        {
+            "msno": "user2",
+            "membership_expire_date": "20170215",
+            "transaction_date": "20170101",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        {
+            "msno": "user2",
+            "membership_expire_date": "20170320",
+            "transaction_date": "20170220",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        # User 3: Edge case - renews on exactly day 30 (should not be churn)
+        {
+            "msno": "user3",
+            "membership_expire_date": "20170215",
+            "transaction_date": "20170101",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        {
+            "msno": "user3",
+            "membership_expire_date": "20170320",
+            "transaction_date": "20170317",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        # User 4: Late renewal (day 31 - should be churn)
+        {
+            "msno": "user4",
+            "membership_expire_date": "20170215",
+            "transaction_date": "20170101",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        {
+            "msno": "user4",
+            "membership_expire_date": "20170320",
+            "transaction_date": "20170318",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        # User 5: Cancellation within window (should still be churn)
+        {
+            "msno": "user5",
+            "membership_expire_date": "20170215",
+            "transaction_date": "20170101",
+            "payment_plan_days": 30,
+            "is_auto_renew": 0,
+            "is_cancel": 0,
+        },
+        {
+            "msno": "user5",
+            "membership_expire_date": "20170320",
+            "transaction_date": "20170220",
+            "payment_plan_days": 0,
+            "is_auto_renew": 0,
+            "is_cancel": 1,
+        },
+    ]
+    return pd.DataFrame(data)
+
+
+@pytest.fixture(scope="session")
+def sample_official_labels():
+    """Create sample official labels for validation."""
+    data = [
+        {"msno": "user1", "is_churn": 1},
+        {"msno": "user2", "is_churn": 0},
+        {"msno": "user3", "is_churn": 0},
+        {"msno": "user4", "is_churn": 1},
+        {"msno": "user5", "is_churn": 1},
+    ]
+    return pd.DataFrame(data)
+
+
+@pytest.fixture(scope="session")
+def labels_csv_dir(tmp_path_factory):
+    """Directory holding the sample label-test CSVs, written once per session."""
+    return tmp_path_factory.mktemp("labels")
+
+
+@pytest.fixture(scope="session")
+def sample_tx_csv_path(labels_csv_dir, sample_transactions):
+    """sample_transactions written to CSV once per session."""
+    path = labels_csv_dir / "transactions.csv"
+    sample_transactions.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="session")
+def sample_labels_csv_path(labels_csv_dir, sample_official_labels):
+    """sample_official_labels written to CSV once per session."""
+    path = labels_csv_dir / "train.csv"
+    sample_official_labels.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="session")
+def binom_sample():
+    """(y_true, y_pred) for 100 samples at a 30% churn rate, drawn once per session."""
+    rng = np.random.default_rng(42)
+    y_true = rng.binomial(1, 0.3, 100)
+    y_pred = np.clip(y_true + rng.normal(0, 0.2, 100), 0.01, 0.99)
+    return y_true, y_pred
@@ -8,158 +8,207 @@ without exposing real customer data.
 Output: tiny_sample.parquet (1k rows) for fast CI pipeline testing
 """
 
+import argparse
+import hashlib
 import os
-import random
+import shutil
 import sys
-from datetime import datetime, timedelta
+import tempfile
+from datetime import datetime
 from pathlib import Path
 
 # typing imports removed - using built-in list/tuple annotations
 import numpy as np
 import pandas as pd
 
+ID_CHARS = np.frombuffer(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=", dtype="S1"
+)
+ID_LENGTH = 44  # KKBOX IDs are ~44 chars
 
-def generate_member_ids(n: int) -> list[str]:
+
+def generate_member_ids(n: int, rng: np.random.Generator | None = None) -> list[str]:
     """Generate synthetic member IDs resembling KKBOX format."""
-    ids = []
-    for i in range(n):
-        # Generate base64-like strings similar to KKBOX IDs
-        chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
-        id_str = "".join(random.choices(chars, k=44))  # KKBOX IDs are ~44 chars
-        ids.append(id_str)
-    return ids
+    rng = rng if rng is not None else np.random.default_rng()
 
+    # Draw all characters at once and view each row of 44 bytes as one base64-like string
+    idx = rng.integers(0, ID_CHARS.size, size=(n, ID_LENGTH))
+    return ID_CHARS[idx].view(f"S{ID_LENGTH}").ravel().astype(str).tolist()
 
-def generate_transactions(
-    member_ids: list[str], start_date: datetime, end_date: datetime
-) -> pd.DataFrame:
-    """Generate synthetic transaction data."""
 
-    transactions = []
-    payment_methods = [1, 2, 3, 4, 5]  # Different payment types
-    plan_options = [30, 90, 180, 365]  # Plan durations
-
-    for msno in member_ids:
-        # Generate 1-5 transactions per user
-        n_transactions = random.randint(1, 5)
-        current_date = start_date + timedelta(days=random.randint(0, 30))
-
-        for _ in range(n_transactions):
-            plan_days = random.choice(plan_options)
-            list_price = {30: 149, 90: 399, 180: 799, 365: 1590}[plan_days]  # Taiwan pricing
-
-            # Sometimes apply discounts
-            discount_factor = random.choice([1.0, 0.9, 0.8, 0.7, 1.0, 1.0])
-            actual_amount = int(list_price * discount_factor)
-
-            expire_date = current_date + timedelta(days=plan_days)
-
-            transaction = {
-                "msno": msno,
-                "payment_method_id": random.choice(payment_methods),
-                "payment_plan_days": plan_days,
-                "plan_list_price": list_price,
-                "actual_amount_paid": actual_amount,
-                "is_auto_renew": random.choice([0, 1]),
-                "is_cancel": random.choice([0, 0, 0, 1]),  # 25% cancel rate
-                "transaction_date": current_date.strftime("%Y%m%d"),
-                "membership_expire_date": expire_date.strftime("%Y%m%d"),
-            }
+def yyyymmdd(start_date: datetime, offsets: np.ndarray) -> np.ndarray:
+    """Day offsets from start_date as int32 YYYYMMDD (KKBOX's integer date encoding)."""
+    days = np.datetime64(start_date, "D") + offsets.astype("timedelta64[D]")
+    months = days.astype("datetime64[M]")
+    year = months.astype(np.int32) // 12 + 1970
+    month = months.astype(np.int32) % 12 + 1
+    day = (days - months).astype(np.int32) + 1
+    return year * 10000 + month * 100 + day
 
-            transactions.append(transaction)
 
-            # Next transaction some time later
-            if random.random() < 0.7:  # 70% renewal probability
-                current_date = expire_date + timedelta(days=random.randint(0, 45))
-            else:
-                break  # User churns
+PLAN_OPTIONS = np.array([30, 90, 180, 365])  # Plan durations
+PLAN_PRICES = np.array([149, 399, 799, 1590])  # Taiwan pricing, aligned with PLAN_OPTIONS
+DISCOUNT_FACTORS = np.array([1.0, 0.9, 0.8, 0.7, 1.0, 1.0])
+MAX_TRANSACTIONS = 5  # Per user
 
-            # Don't go past end date
-            if current_date > end_date:
-                break
 
-    return pd.DataFrame(transactions)
+def generate_transactions(
+    member_ids: list[str],
+    start_date: datetime,
+    end_date: datetime,
+    rng: np.random.Generator | None = None,
+) -> pd.DataFrame:
+    """Generate synthetic transaction data."""
+    rng = rng if rng is not None else np.random.default_rng()
+
+    n_users = len(member_ids)
+    end_offset = (end_date - start_date).days
+
+    # Generate 1-5 transactions per user; dates are tracked as day offsets from start_date
+    n_transactions = rng.integers(1, MAX_TRANSACTIONS + 1, size=n_users)
+    current = rng.integers(0, 31, size=n_users)
+    alive = np.ones(n_users, dtype=bool)
+
+    # Preallocated (user, step) buffers; each step fills one column for every user at once
+    shape = (n_users, MAX_TRANSACTIONS)
+    taken = np.zeros(shape, dtype=bool)
+    payment_method = np.zeros(shape, dtype=np.int8)
+    plan_days_out = np.zeros(shape, dtype=np.int16)
+    list_price_out = np.zeros(shape, dtype=np.int16)
+    amount_paid = np.zeros(shape, dtype=np.int16)
+    auto_renew = np.zeros(shape, dtype=np.int8)
+    cancel = np.zeros(shape, dtype=np.int8)
+    tx_offset = np.zeros(shape, dtype=np.int32)
+    exp_offset = np.zeros(shape, dtype=np.int32)
+
+    # Advance every user's renewal chain one transaction at a time (at most 5 steps)
+    for step in range(MAX_TRANSACTIONS):
+        active = alive & (step < n_transactions)
+        if not active.any():
+            break
+
+        plan = rng.integers(0, len(PLAN_OPTIONS), size=n_users)
+        plan_days = PLAN_OPTIONS[plan]
+        list_price = PLAN_PRICES[plan]
+
+        # Sometimes apply discounts
+        discount = DISCOUNT_FACTORS[rng.integers(0, len(DISCOUNT_FACTORS), size=n_users)]
+        expire = current + plan_days
+
+        taken[:, step] = active
+        payment_method[:, step] = rng.integers(1, 6, size=n_users)
+        plan_days_out[:, step] = plan_days
+        list_price_out[:, step] = list_price
+        amount_paid[:, step] = (list_price * discount).astype(int)
+        auto_renew[:, step] = rng.integers(0, 2, size=n_users)
+        cancel[:, step] = rng.random(n_users) < 0.25  # 25% cancel rate
+        tx_offset[:, step] = current
+        exp_offset[:, step] = expire
+
+        # Next transaction some time later (70% renewal probability), else the user churns;
+        # don't go past end date
+        renew = rng.random(n_users) < 0.7
+        current = np.where(renew, expire + rng.integers(0, 46, size=n_users), current)
+        alive = active & renew & (current <= end_offset)
+
+    # Boolean indexing walks the buffers row-major, i.e. already ordered by (user, step)
+    user = np.broadcast_to(np.arange(n_users)[:, None], shape)[taken]
+
+    return pd.DataFrame(
+        {
+            "msno": np.asarray(member_ids, dtype=object)[user],
+            "payment_method_id": payment_method[taken],
+            "payment_plan_days": plan_days_out[taken],
+            "plan_list_price": list_price_out[taken],
+            "actual_amount_paid": amount_paid[taken],
+            "is_auto_renew": auto_renew[taken],
+            "is_cancel": cancel[taken],
+            "transaction_date": yyyymmdd(start_date, tx_offset[taken]),
+            "membership_expire_date": yyyymmdd(start_date, exp_offset[taken]),
+        }
+    )
 
 
 def generate_user_logs(
-    member_ids: list[str], start_date: datetime, end_date: datetime
+    member_ids: list[str],
+    start_date: datetime,
+    end_date: datetime,
+    rng: np.random.Generator | None = None,
 ) -> pd.DataFrame:
     """Generate synthetic user listening logs."""
+    rng = rng if rng is not None else np.random.default_rng()
+
+    n_days, n_users = (end_date - start_date).days + 1, len(member_ids)
+
+    # Random subset of users are active each day: rank users by a random key per day
+    # and keep the first k of each row (sampling without replacement, all days at once)
+    k = np.minimum(rng.integers(100, 401, size=n_days), n_users)
+    order = rng.random((n_days, n_users)).argsort(axis=1)
+    user_idx = order[np.arange(n_users) < k[:, None]]
+    day_idx = np.repeat(np.arange(n_days), k)
+    n_rows = len(user_idx)
+
+    # Listening activity; array-valued upper bounds keep the play counts monotonic
+    num_25 = rng.integers(0, 51, size=n_rows)  # Songs played >25%
+    num_50 = rng.integers(0, num_25 + 1)  # Songs played >50%
+    num_75 = rng.integers(0, num_50 + 1)  # Songs played >75%
+    num_985 = rng.integers(0, num_75 + 1)  # Songs played >98.5%
+    num_100 = rng.integers(0, num_985 + 1)  # Songs played 100%
+    num_unq = rng.integers(num_100, num_25 + 21)  # Unique songs
+    total_secs = rng.integers(num_25 * 30, num_25 * 300 + 1)  # Total listening time
+
+    return pd.DataFrame(
+        {
+            "msno": np.asarray(member_ids, dtype=object)[user_idx],
+            "date": yyyymmdd(start_date, day_idx),
+            "num_25": num_25,
+            "num_50": num_50,
+            "num_75": num_75,
+            "num_985": num_985,
+            "num_100": num_100,
+            "num_unq": num_unq,
+            "total_secs": total_secs,
+        }
+    )
 
-    logs = []
-    current_date = start_date
-
-    while current_date <= end_date:
-        # Random subset of users are active each day
-        active_users = random.sample(member_ids, k=random.randint(100, 400))
-
-        for msno in active_users:
-            # Generate listening activity
-            num_25 = random.randint(0, 50)  # Songs played >25%
-            num_50 = random.randint(0, num_25)  # Songs played >50%
-            num_75 = random.randint(0, num_50)  # Songs played >75%
-            num_985 = random.randint(0, num_75)  # Songs played >98.5%
-            num_100 = random.randint(0, num_985)  # Songs played 100%
-            num_unq = random.randint(num_100, num_25 + 20)  # Unique songs
-            total_secs = random.randint(num_25 * 30, num_25 * 300)  # Total listening time
-
-            log = {
-                "msno": msno,
-                "date": current_date.strftime("%Y%m%d"),
-                "num_25": num_25,
-                "num_50": num_50,
-                "num_75": num_75,
-                "num_985": num_985,
-                "num_100": num_100,
-                "num_unq": num_unq,
-                "total_secs": total_secs,
-            }
-
-            logs.append(log)
-
-        current_date += timedelta(days=1)
 
-    return pd.DataFrame(logs)
+CITIES = np.arange(1, 23)  # Taiwan city codes
+REGISTRATION_METHODS = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 16, 17], dtype=np.int8)
 
 
-def generate_members(member_ids: list[str]) -> pd.DataFrame:
+def generate_members(member_ids: list[str], rng: np.random.Generator | None = None) -> pd.DataFrame:
     """Generate synthetic member demographic data."""
-
-    members = []
-    cities = list(range(1, 23))  # Taiwan city codes
-    registration_methods = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 16, 17]
-
-    for msno in member_ids:
-        # Generate realistic demographics
-        age = random.randint(15, 70)
-        gender = random.choice(["male", "female", ""])  # Some missing
-
-        member = {
-            "msno": msno,
-            "city": random.choice(cities + [None]),  # Some missing
-            "bd": age,
-            "gender": gender,
-            "registered_via": random.choice(registration_methods),
-            "registration_init_time": random.randint(20050101, 20160101),  # Registration dates
+    rng = rng if rng is not None else np.random.default_rng()
+
+    n = len(member_ids)
+
+    # City drawn uniformly over the 22 codes plus "missing"
+    city = rng.integers(0, len(CITIES) + 1, size=n)
+    city = np.where(city < len(CITIES), CITIES[np.minimum(city, len(CITIES) - 1)], np.nan)
+
+    return pd.DataFrame(
+        {
+            "msno": member_ids,
+            "city": city,  # Some missing
+            "bd": rng.integers(15, 71, size=n, dtype=np.int8),
+            "gender": np.array(["male", "female", ""])[rng.integers(0, 3, size=n)],  # Some missing
+            "registered_via": rng.choice(REGISTRATION_METHODS, size=n),
+            "registration_init_time": rng.integers(20050101, 20160102, size=n, dtype=np.int32),
         }
-
-        members.append(member)
-
-    return pd.DataFrame(members)
+    )
 
 
-def generate_train_labels(member_ids: list[str], churn_rate: float = 0.05) -> pd.DataFrame:
+def generate_train_labels(
+    member_ids: list[str], churn_rate: float = 0.05, rng: np.random.Generator | None = None
+) -> pd.DataFrame:
     """Generate synthetic train labels with realistic churn rate."""
+    rng = rng if rng is not None else np.random.default_rng()
 
-    labels = []
-    n_churners = int(len(member_ids) * churn_rate)
-    churners = set(random.sample(member_ids, n_churners))
+    n = len(member_ids)
+    is_churn = np.zeros(n, dtype=np.int8)
+    is_churn[rng.choice(n, int(n * churn_rate), replace=False)] = 1  # Exact churner count
 
-    for msno in member_ids:
-        label = {"msno": msno, "is_churn": 1 if msno in churners else 0}
-        labels.append(label)
-
-    return pd.DataFrame(labels)
+    return pd.DataFrame({"msno": member_ids, "is_churn": is_churn})
 
 
 def generate_kkbox_dataset(n_samples: int = 1000) -> dict:
@@ -172,22 +221,21 @@ def generate_kkbox_dataset(n_samples: int = 1000) -> dict:
     Returns:
         dict with keys: train, transactions, user_logs, members
     """
-    # Set random seed for reproducibility
-    random.seed(42)
-    np.random.seed(42)
+    # Single seeded generator shared by every table for reproducibility
+    rng = np.random.default_rng(42)
 
     # Configuration
     start_date = datetime(2016, 1, 1)
     end_date = datetime(2017, 5, 31)
 
     # Generate member IDs
-    member_ids = generate_member_ids(n_samples)
+    member_ids = generate_member_ids(n_samples, rng)
 
     # Generate all data tables
-    transactions = generate_transactions(member_ids, start_date, end_date)
-    user_logs = generate_user_logs(member_ids, start_date, end_date)
-    members = generate_members(member_ids)
-    train_labels = generate_train_labels(member_ids)
+    transactions = generate_transactions(member_ids, start_date, end_date, rng)
+    user_logs = generate_user_logs(member_ids, start_date, end_date, rng)
+    members = generate_members(member_ids, rng)
+    train_labels = generate_train_labels(member_ids, rng=rng)
 
     return {
         "train": train_labels,
@@ -197,13 +245,120 @@ def generate_kkbox_dataset(n_samples: int = 1000) -> dict:
     }
 
 
+FIXTURE_TABLES = {
+    "transactions": "transactions_synthetic",
+    "user_logs": "user_logs_synthetic",
+    "members": "members_synthetic",
+    "train": "train_synthetic",
+}
+
+
+def write_fixture_files(dataset: dict, out_dir: Path, fmt: str = "parquet") -> dict[str, Path]:
+    """
+    Write the synthetic tables as individual files.
+
+    Args:
+        dataset: Output of generate_kkbox_dataset
+        out_dir: Directory to write the fixture files into
+        fmt: "parquet" (zstd-compressed, default) or "csv"
+
+    Returns:
+        dict mapping table name to written file path
+    """
+    if fmt not in ("parquet", "csv"):
+        raise ValueError(f"Unknown fixture format: {fmt}")
+
+    write_csv = None
+    if fmt == "csv":
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+
+            # Multithreaded C++ writer; much faster than DataFrame.to_csv
+            def write_csv(df, path):
+                pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+        except ImportError:
+            pass  # Will use DataFrame.to_csv
+
+    out_dir = Path(out_dir)
+    paths = {}
+    for table_name, stem in FIXTURE_TABLES.items():
+        paths[table_name] = out_dir / f"{stem}.{fmt}"
+        if fmt == "parquet":
+            dataset[table_name].to_parquet(paths[table_name], compression="zstd", index=False)
+        elif write_csv is not None:
+            write_csv(dataset[table_name], paths[table_name])
+        else:
+            dataset[table_name].to_csv(paths[table_name], index=False)
+    return paths
+
+
+SYNTHETIC_VIEWS = {
+    "transactions": "transactions_synth",
+    "user_logs": "user_logs_synth",
+    "members": "members_synth",
+    "train": "train_synth",
+}
+
+
+def register_synthetic_tables(con, dataset: dict):
+    """
+    Register the synthetic DataFrames as DuckDB views (zero-copy, no file I/O).
+
+    Args:
+        con: DuckDB connection
+        dataset: Output of generate_kkbox_dataset
+
+    Returns:
+        The same connection, with SYNTHETIC_VIEWS bound
+    """
+    for table_name, view_name in SYNTHETIC_VIEWS.items():
+        con.register(view_name, dataset[table_name])
+    return con
+
+
+FIXTURE_CACHE_DIR = Path(
+    os.environ.get("KKBOX_FIXTURE_CACHE", Path.home() / ".cache" / "kkbox-fixtures")
+)
+
+
+def fixture_cache_key(n_users: int, fmt: str) -> str:
+    """Content hash of this generator's source and settings (output is seeded, so deterministic)."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(f"{n_users}:{fmt}".encode())
+    return digest.hexdigest()[:16]
+
+
 def main():
     """Generate complete synthetic KKBOX dataset."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--csv", action="store_true", help="Write CSV fixtures instead of Parquet (legacy format)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always regenerate instead of reusing {FIXTURE_CACHE_DIR}/<hash>/",
+    )
+    args = parser.parse_args()
 
     # Configuration
     n_users = 1000
     start_date = datetime(2016, 1, 1)
     end_date = datetime(2017, 5, 31)
+    fmt = "csv" if args.csv else "parquet"
+
+    # Save as individual fixture files
+    fixtures_dir = Path(__file__).parent
+
+    # Reuse a previous build when neither this file nor the settings have changed
+    cache_dir = FIXTURE_CACHE_DIR / fixture_cache_key(n_users, fmt)
+    if not args.no_cache and cache_dir.is_dir():
+        for path in cache_dir.iterdir():
+            shutil.copy2(path, fixtures_dir / path.name)
+        print(f"[OK] Reused cached synthetic fixtures from {cache_dir}")
+        return
 
     print(f"[*] Generating synthetic KKBOX dataset with {n_users} users...")
 
@@ -214,16 +369,16 @@ def main():
     members = dataset["members"]
     train_labels = dataset["train"]
 
-    # Save as individual CSV files
-    fixtures_dir = Path(__file__).parent
-
-    transactions.to_csv(fixtures_dir / "transactions_synthetic.csv", index=False)
-    user_logs.to_csv(fixtures_dir / "user_logs_synthetic.csv", index=False)
-    members.to_csv(fixtures_dir / "members_synthetic.csv", index=False)
-    train_labels.to_csv(fixtures_dir / "train_synthetic.csv", index=False)
-
-    # Save as parquet for efficiency (optional - skip if pyarrow not available)
     try:
+        written = list(write_fixture_files(dataset, fixtures_dir, fmt=fmt).values())
+    except ImportError:
+        print("   [!] pyarrow not installed - writing CSV fixtures instead of Parquet")
+        fmt = "csv"
+        written = list(write_fixture_files(dataset, fixtures_dir, fmt=fmt).values())
+
+    # Row-count summary alongside the Parquet fixtures
+    if fmt == "parquet":
+        written.append(fixtures_dir / "tiny_sample.parquet")
         pd.DataFrame(
             {
                 "tables": [
@@ -233,9 +388,17 @@ def main():
                     str(len(train_labels)),
                 ]
             }
-        ).to_parquet(fixtures_dir / "tiny_sample.parquet")
-    except ImportError:
-        print("   [!] Skipping parquet (pyarrow not installed) - CSV files are sufficient")
+        ).to_parquet(written[-1])
+
+    # Populate the cache (not after a CSV fallback, which the Parquet key would mislabel);
+    # stage in a temp dir + rename so an interrupted run never leaves a partial entry
+    if not args.no_cache and cache_dir.name == fixture_cache_key(n_users, fmt):
+        FIXTURE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=FIXTURE_CACHE_DIR))
+        for path in written:
+            shutil.copy2(path, staging / path.name)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        staging.rename(cache_dir)
 
     print("[OK] Synthetic dataset generated:")
     print(f"   - Transactions: {len(transactions):,}")
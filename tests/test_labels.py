@@ -10,181 +10,64 @@ Tests cover:
 - Error handling for malformed data
 """
 
-import os
-
-# Add src to path for imports
-import sys
-import tempfile
 from datetime import datetime, timedelta
-from pathlib import Path
 
 import pandas as pd
 import pytest
 
-sys.path.append(str(Path(__file__).parent.parent / "src"))
-
 from labels import analyze_mismatches, create_churn_labels, validate_labels
 
 
-class TestChurnLabels:
-    """Test suite for 30-day churn rule implementation."""
+@pytest.fixture(scope="module")
+def churn_result(sample_tx_csv_path, sample_labels_csv_path):
+    """Labels built once per module from the shared sample CSVs; treat as read-only."""
+    return create_churn_labels(
+        transactions_path=str(sample_tx_csv_path),
+        train_labels_path=str(sample_labels_csv_path),
+        cutoff_date="2017-03-01",
+        window_days=30,
+    )
 
-    @pytest.fixture
-    def sample_transactions(self):
-        """Create sample transaction data for testing."""
-        data = [
-            # User 1: Churns - expires 2017-02-15, no renewal within 30 days
-            {
-                "msno": "user1",
-                "membership_expire_date": "20170215",
-                "transaction_date": "20170101",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            # User 2: Renews - expires 2017-02-15, renews on 2017-02-20 (5 days later)
-            {
-                "msno": "user2",
-                "membership_expire_date": "20170215",
-                "transaction_date": "20170101",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            {
-                "msno": "user2",
-                "membership_expire_date": "20170320",
-                "transaction_date": "20170220",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            # User 3: Edge case - renews on exactly day 30 (should not be churn)
-            {
-                "msno": "user3",
-                "membership_expire_date": "20170215",
-                "transaction_date": "20170101",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            {
-                "msno": "user3",
-                "membership_expire_date": "20170320",
-                "transaction_date": "20170317",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            # User 4: Late renewal (day 31 - should be churn)
-            {
-                "msno": "user4",
-                "membership_expire_date": "20170215",
-                "transaction_date": "20170101",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            {
-                "msno": "user4",
-                "membership_expire_date": "20170320",
-                "transaction_date": "20170318",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            # User 5: Cancellation within window (should still be churn)
-            {
-                "msno": "user5",
-                "membership_expire_date": "20170215",
-                "transaction_date": "20170101",
-                "payment_plan_days": 30,
-                "is_auto_renew": 0,
-                "is_cancel": 0,
-            },
-            {
-                "msno": "user5",
-                "membership_expire_date": "20170320",
-                "transaction_date": "20170220",
-                "payment_plan_days": 0,
-                "is_auto_renew": 0,
-                "is_cancel": 1,
-            },
-        ]
-        return pd.DataFrame(data)
-
-    @pytest.fixture
-    def sample_official_labels(self):
-        """Create sample official labels for validation."""
-        data = [
-            {"msno": "user1", "is_churn": 1},
-            {"msno": "user2", "is_churn": 0},
-            {"msno": "user3", "is_churn": 0},
-            {"msno": "user4", "is_churn": 1},
-            {"msno": "user5", "is_churn": 1},
-        ]
-        return pd.DataFrame(data)
 
-    def test_basic_churn_rule(self, sample_transactions, sample_official_labels):
-        """Test basic 30-day churn rule logic."""
+@pytest.fixture(scope="module")
+def churn_by_user(churn_result):
+    """msno -> is_churn from churn_result, built once for all per-user checks."""
+    return churn_result.set_index("msno")["is_churn"].to_dict()
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            sample_transactions.to_csv(f.name, index=False)
-            tx_path = f.name
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            sample_official_labels.to_csv(f.name, index=False)
-            labels_path = f.name
-
-        try:
-            result = create_churn_labels(
-                transactions_path=tx_path,
-                train_labels_path=labels_path,
-                cutoff_date="2017-03-01",
-                window_days=30,
-            )
-
-            # Check that all users are present
-            assert len(result) == 5
-            assert set(result["msno"]) == {"user1", "user2", "user3", "user4", "user5"}
-
-            # Check churn labels
-            user_labels = result.set_index("msno")["is_churn"].to_dict()
-
-            assert user_labels["user1"] == 1, "User1 should churn (no renewal)"
-            assert user_labels["user2"] == 0, "User2 should not churn (renewed day 5)"
-            assert user_labels["user3"] == 0, "User3 should not churn (renewed day 30)"
-            assert user_labels["user4"] == 1, "User4 should churn (renewed day 31)"
-            assert user_labels["user5"] == 1, "User5 should churn (cancellation, not renewal)"
+class TestChurnLabels:
+    """Test suite for 30-day churn rule implementation."""
 
-        finally:
-            os.unlink(tx_path)
-            os.unlink(labels_path)
+    def test_basic_churn_rule(self, churn_result):
+        """Test basic 30-day churn rule logic."""
 
-    def test_validation_accuracy(self, sample_transactions, sample_official_labels):
+        # Check that all users are present
+        assert len(churn_result) == 5
+        assert set(churn_result["msno"]) == {"user1", "user2", "user3", "user4", "user5"}
+
+    @pytest.mark.parametrize(
+        "user,expected,reason",
+        [
+            ("user1", 1, "no renewal"),
+            ("user2", 0, "renewed day 5"),
+            ("user3", 0, "renewed day 30"),
+            ("user4", 1, "renewed day 31"),
+            ("user5", 1, "cancellation, not renewal"),
+        ],
+    )
+    def test_churn_for_user(self, churn_by_user, user, expected, reason):
+        """Each sample user gets the label the 30-day rule implies."""
+        assert churn_by_user[user] == expected, f"{user} should have is_churn={expected} ({reason})"
+
+    def test_validation_accuracy(self, churn_result):
         """Test label validation against official labels."""
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            sample_transactions.to_csv(f.name, index=False)
-            tx_path = f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            sample_official_labels.to_csv(f.name, index=False)
-            labels_path = f.name
-
-        try:
-            result = create_churn_labels(tx_path, labels_path, "2017-03-01")
-
-            # Should achieve 100% accuracy on this test case
-            accuracy, matches, total = validate_labels(result, min_accuracy=0.99)
+        # Should achieve 100% accuracy on this test case
+        accuracy, matches, total = validate_labels(churn_result, min_accuracy=0.99)
 
-            assert accuracy == 1.0, f"Expected 100% accuracy, got {accuracy:.4f}"
-            assert matches == 5, f"Expected 5 matches, got {matches}"
-            assert total == 5, f"Expected 5 comparable, got {total}"
-
-        finally:
-            os.unlink(tx_path)
-            os.unlink(labels_path)
+        assert accuracy == 1.0, f"Expected 100% accuracy, got {accuracy:.4f}"
+        assert matches == 5, f"Expected 5 matches, got {matches}"
+        assert total == 5, f"Expected 5 comparable, got {total}"
 
     def test_edge_case_same_day_renewal(self):
         """Test edge case: renewal on same day as expiration."""
@@ -210,23 +93,12 @@ class TestChurnLabels:
 
         official_data = [{"msno": "user1", "is_churn": 0}]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            pd.DataFrame(tx_data).to_csv(f.name, index=False)
-            tx_path = f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            pd.DataFrame(official_data).to_csv(f.name, index=False)
-            labels_path = f.name
-
-        try:
-            result = create_churn_labels(tx_path, labels_path, "2017-03-01")
-
-            # Same day renewal should NOT be churn (renewal is after expiration)
-            assert result.iloc[0]["is_churn"] == 0, "Same-day renewal should not be churn"
+        result = create_churn_labels(
+            pd.DataFrame(tx_data), pd.DataFrame(official_data), "2017-03-01"
+        )
 
-        finally:
-            os.unlink(tx_path)
-            os.unlink(labels_path)
+        # Same day renewal should NOT be churn (renewal is after expiration)
+        assert result.iloc[0]["is_churn"] == 0, "Same-day renewal should not be churn"
 
     def test_multiple_expirations_per_user(self):
         """Test users with multiple expiration dates - should use the last one."""
@@ -254,26 +126,15 @@ class TestChurnLabels:
 
         official_data = [{"msno": "user1", "is_churn": 1}]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            pd.DataFrame(tx_data).to_csv(f.name, index=False)
-            tx_path = f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            pd.DataFrame(official_data).to_csv(f.name, index=False)
-            labels_path = f.name
-
-        try:
-            result = create_churn_labels(tx_path, labels_path, "2017-03-01")
-
-            # Should use latest expiration date (2017-02-15)
-            assert result.iloc[0]["expire_date"].strftime("%Y-%m-%d") == "2017-02-15"
-            assert result.iloc[0]["is_churn"] == 1, "User should churn from latest expiration"
+        result = create_churn_labels(
+            pd.DataFrame(tx_data), pd.DataFrame(official_data), "2017-03-01"
+        )
 
-        finally:
-            os.unlink(tx_path)
-            os.unlink(labels_path)
+        # Should use latest expiration date (2017-02-15)
+        assert result.iloc[0]["expire_date"].strftime("%Y-%m-%d") == "2017-02-15"
+        assert result.iloc[0]["is_churn"] == 1, "User should churn from latest expiration"
 
-    def test_malformed_dates(self):
+    def test_malformed_dates(self, tmp_path):
         """Test handling of malformed date data."""
 
         tx_data = [
@@ -305,24 +166,17 @@ class TestChurnLabels:
 
         official_data = [{"msno": "user1", "is_churn": 1}]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            pd.DataFrame(tx_data).to_csv(f.name, index=False)
-            tx_path = f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            pd.DataFrame(official_data).to_csv(f.name, index=False)
-            labels_path = f.name
-
-        try:
-            result = create_churn_labels(tx_path, labels_path, "2017-03-01")
+        # Written to CSV so the None/"invalid" dates go through the CSV reader, as in production
+        tx_path = tmp_path / "transactions.csv"
+        labels_path = tmp_path / "train.csv"
+        pd.DataFrame(tx_data).to_csv(tx_path, index=False)
+        pd.DataFrame(official_data).to_csv(labels_path, index=False)
 
-            # Should only include user1 (valid date)
-            assert len(result) == 1
-            assert result.iloc[0]["msno"] == "user1"
+        result = create_churn_labels(str(tx_path), str(labels_path), "2017-03-01")
 
-        finally:
-            os.unlink(tx_path)
-            os.unlink(labels_path)
+        # Should only include user1 (valid date)
+        assert len(result) == 1
+        assert result.iloc[0]["msno"] == "user1"
 
     def test_file_not_found_error(self):
         """Test error handling for missing files."""
@@ -8,19 +8,28 @@ These tests cover:
 - Basic functionality
 """
 
-import sys
-from pathlib import Path
-
 import numpy as np
 import pandas as pd
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
 
 from error_analysis import ChurnErrorAnalyzer
 from temporal_cv import BootstrapMetrics, ChurnTemporalCV, TemporalSplit
 
 
+@pytest.fixture(scope="module")
+def analysis_features(binom_sample):
+    """Per-member feature frame aligned with binom_sample, built once per module."""
+    n = len(binom_sample[0])
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        {
+            "msno": [f"user_{i}" for i in range(n)],
+            "feature1": rng.standard_normal(n),
+            "feature2": rng.standard_normal(n),
+        }
+    )
+
+
 class TestTemporalSplit:
     """Tests for TemporalSplit class."""
 
@@ -67,96 +76,69 @@ class TestChurnTemporalCV:
 class TestBootstrapMetrics:
     """Tests for BootstrapMetrics class."""
 
-    def test_basic_bootstrap(self):
+    def test_basic_bootstrap(self, binom_sample):
         """Test basic bootstrap computation."""
-        np.random.seed(42)
-        y_true = np.random.binomial(1, 0.3, 100)
-        y_pred = np.clip(y_true + np.random.normal(0, 0.2, 100), 0.01, 0.99)
+        y_true, y_pred = binom_sample
 
         bootstrap = BootstrapMetrics(n_bootstrap=50, random_state=42)
         results = bootstrap.compute(y_true, y_pred)
 
-        # Check all metrics are present
-        assert "log_loss" in results
-        assert "auc" in results
-        assert "brier" in results
-
-        # Check each metric has required keys
+        # Check all metrics are present, each with the required keys
+        assert {"log_loss", "auc", "brier"} <= results.keys()
         for metric in results.values():
-            assert "mean" in metric
-            assert "std" in metric
-            assert "ci_lower" in metric
-            assert "ci_upper" in metric
+            assert {"mean", "std", "ci_lower", "ci_upper"} <= metric.keys()
 
         # CI should be valid
-        for metric in results.values():
-            assert metric["ci_lower"] <= metric["mean"] <= metric["ci_upper"]
+        means = np.array([m["mean"] for m in results.values()])
+        los = np.array([m["ci_lower"] for m in results.values()])
+        his = np.array([m["ci_upper"] for m in results.values()])
+        assert np.all(los <= means) and np.all(means <= his)
 
     def test_empty_input_raises(self):
         """Test that empty inputs raise ValueError."""
         bootstrap = BootstrapMetrics()
-        try:
+        with pytest.raises(ValueError, match="(?i)empty"):
             bootstrap.compute(np.array([]), np.array([]))
-            assert False, "Should raise ValueError for empty input"
-        except ValueError as e:
-            assert "empty" in str(e).lower()
 
     def test_length_mismatch_raises(self):
         """Test that mismatched lengths raise ValueError."""
         bootstrap = BootstrapMetrics()
-        try:
+        with pytest.raises(ValueError, match="(?i)mismatch"):
             bootstrap.compute(np.array([0, 1, 0]), np.array([0.5, 0.5]))
-            assert False, "Should raise ValueError for length mismatch"
-        except ValueError as e:
-            assert "mismatch" in str(e).lower()
 
     def test_invalid_probabilities_raises(self):
         """Test that invalid probabilities raise ValueError."""
         bootstrap = BootstrapMetrics()
-        try:
+        with pytest.raises(ValueError, match=r"(?i)probabilities|\[0, 1\]"):
             bootstrap.compute(np.array([0, 1, 0]), np.array([0.5, 1.5, 0.3]))
-            assert False, "Should raise ValueError for invalid probabilities"
-        except ValueError as e:
-            assert "probabilities" in str(e).lower() or "[0, 1]" in str(e)
 
     def test_single_class_raises(self):
         """Test that single-class y_true raises ValueError."""
         bootstrap = BootstrapMetrics()
-        try:
+        with pytest.raises(ValueError, match="(?i)class"):
             bootstrap.compute(np.array([0, 0, 0]), np.array([0.5, 0.5, 0.5]))
-            assert False, "Should raise ValueError for single class"
-        except ValueError as e:
-            assert "class" in str(e).lower()
 
 
 class TestChurnErrorAnalyzer:
     """Tests for ChurnErrorAnalyzer class."""
 
-    def test_basic_analysis(self):
+    def test_basic_analysis(self, binom_sample, analysis_features):
         """Test basic error analysis."""
-        np.random.seed(42)
-        n = 100
-
-        features_df = pd.DataFrame(
-            {
-                "msno": [f"user_{i}" for i in range(n)],
-                "feature1": np.random.randn(n),
-                "feature2": np.random.randn(n),
-            }
-        )
-
-        y_true = np.random.binomial(1, 0.3, n)
-        y_pred = np.clip(y_true * 0.7 + np.random.uniform(0, 0.3, n), 0, 1)
+        y_true, y_pred = binom_sample
+        features_df = analysis_features
+        n = len(features_df)
 
         analyzer = ChurnErrorAnalyzer(threshold=0.5)
         results = analyzer.analyze(y_true, y_pred, features_df)
 
         # Check all sections present
-        assert "summary" in results
-        assert "confidence_analysis" in results
-        assert "segment_analysis" in results
-        assert "business_impact" in results
-        assert "recommendations" in results
+        assert {
+            "summary",
+            "confidence_analysis",
+            "segment_analysis",
+            "business_impact",
+            "recommendations",
+        } <= results.keys()
 
         # Check summary contents
         assert "n_samples" in results["summary"]
@@ -165,59 +147,12 @@ class TestChurnErrorAnalyzer:
     def test_empty_input_raises(self):
         """Test that empty inputs raise ValueError."""
         analyzer = ChurnErrorAnalyzer()
-        try:
+        with pytest.raises(ValueError, match="(?i)empty"):
             analyzer.analyze(np.array([]), np.array([]), pd.DataFrame())
-            assert False, "Should raise ValueError for empty input"
-        except ValueError as e:
-            assert "empty" in str(e).lower()
 
     def test_length_mismatch_raises(self):
         """Test that mismatched lengths raise ValueError."""
         analyzer = ChurnErrorAnalyzer()
         features_df = pd.DataFrame({"x": [1, 2, 3]})
-        try:
+        with pytest.raises(ValueError, match="(?i)mismatch|length"):
             analyzer.analyze(np.array([0, 1]), np.array([0.5, 0.5]), features_df)
-            assert False, "Should raise ValueError for length mismatch"
-        except ValueError as e:
-            assert "mismatch" in str(e).lower() or "length" in str(e).lower()
-
-
-def run_tests():
-    """Run all tests and report results."""
-    test_classes = [
-        TestTemporalSplit,
-        TestChurnTemporalCV,
-        TestBootstrapMetrics,
-        TestChurnErrorAnalyzer,
-    ]
-
-    total_passed = 0
-    total_failed = 0
-
-    for test_class in test_classes:
-        print(f"\n{'='*50}")
-        print(f"Testing {test_class.__name__}")
-        print("=" * 50)
-
-        instance = test_class()
-        methods = [m for m in dir(instance) if m.startswith("test_")]
-
-        for method_name in methods:
-            try:
-                getattr(instance, method_name)()
-                print(f"  ✅ {method_name}")
-                total_passed += 1
-            except Exception as e:
-                print(f"  ❌ {method_name}: {e}")
-                total_failed += 1
-
-    print(f"\n{'='*50}")
-    print(f"Results: {total_passed} passed, {total_failed} failed")
-    print("=" * 50)
-
-    return total_failed == 0
-
-
-if __name__ == "__main__":
-    success = run_tests()
-    exit(0 if success else 1)
@@ -6,14 +6,30 @@ Verifies that no future data leaks into features by fabricating test data
 with events after the cutoff and asserting zero rows contain future information.
 """
 
+import string
 import tempfile
+from datetime import date
 from pathlib import Path
 
 import duckdb
 import pandas as pd
+import pytest
 
+_SQL_PATH = Path(__file__).parent.parent / "features" / "features_simple.sql"
 
-def test_no_future_data_leakage():
+# Read once at import; substitute() fills all four ${..._path} placeholders in one pass
+_SQL_TEMPLATE = string.Template(_SQL_PATH.read_text())
+
+
+@pytest.fixture(scope="module")
+def duck_con():
+    """One in-memory DuckDB connection shared by the tests in this module."""
+    con = duckdb.connect(":memory:")
+    yield con
+    con.close()
+
+
+def test_no_future_data_leakage(duck_con):
     """
     Test that fabricated future events don't leak into features.
 
@@ -25,115 +41,103 @@ def test_no_future_data_leakage():
     Asserts that feature engineering returns zero future events.
     """
 
-    # Create temporary test data
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-
-        # Train labels
-        train_data = pd.DataFrame({"msno": ["user1", "user2", "user3"], "is_churn": [0, 1, 0]})
-        train_path = temp_path / "train.csv"
-        train_data.to_csv(train_path, index=False)
-
-        # Transactions: mix of past and future dates
-        tx_data = pd.DataFrame(
-            {
-                "msno": ["user1", "user1", "user2", "user2", "user3"],
-                "transaction_date": [
-                    20170228,
-                    20170301,
-                    20170227,
-                    20170302,
-                    20170226,
-                ],  # Some future!
-                "payment_plan_days": [30, 30, 30, 30, 30],
-                "is_auto_renew": [1, 1, 0, 1, 1],
-                "is_cancel": [0, 0, 0, 0, 0],
-            }
-        )
-        tx_path = temp_path / "transactions.csv"
-        tx_data.to_csv(tx_path, index=False)
-
-        # User logs: mix of past and future dates
-        logs_data = pd.DataFrame(
-            {
-                "msno": ["user1", "user1", "user1", "user2", "user2", "user3"],
-                "date": [
-                    20170227,
-                    20170228,
-                    20170301,
-                    20170226,
-                    20170302,
-                    20170225,
-                ],  # Some future!
-                "total_secs": [3600, 1800, 7200, 2400, 5400, 900],
-                "num_unq": [10, 5, 20, 8, 15, 3],
-            }
-        )
-        logs_path = temp_path / "user_logs.csv"
-        logs_data.to_csv(logs_path, index=False)
-
-        # Members data
-        members_data = pd.DataFrame(
-            {
-                "msno": ["user1", "user2", "user3"],
-                "gender": ["male", "female", "male"],
-                "bd": [25, 30, 35],
-            }
-        )
-        members_path = temp_path / "members.csv"
-        members_data.to_csv(members_path, index=False)
-
-        # Read the feature SQL template
-        sql_template_path = Path(__file__).parent.parent / "features" / "features_simple.sql"
-        with open(sql_template_path) as f:
-            sql_template = f.read()
-
-        # Substitute paths
-        sql_query = sql_template.replace("${train_path}", str(train_path))
-        sql_query = sql_query.replace("${transactions_path}", str(tx_path))
-        sql_query = sql_query.replace("${user_logs_path}", str(logs_path))
-        sql_query = sql_query.replace("${members_path}", str(members_path))
-
-        # Execute feature engineering
-        con = duckdb.connect()
-        result = con.execute(sql_query).fetchdf()
-        con.close()
-
-        # Verify no future data leaked
-        print(f"Feature engineering returned {len(result)} rows")
-        print("Cutoff date: 2017-02-28")
-
-        # Check specific user feature values to ensure future data didn't leak
-        user1_features = result[result["msno"] == "user1"].iloc[0]
-        user2_features = result[result["msno"] == "user2"].iloc[0]
-
-        # user1 had logs on 20170227, 20170228 (past) and 20170301 (future)
-        # Only past logs should count: 3600 + 1800 = 5400 total_secs
-        assert (
-            user1_features["secs_30d"] == 5400
-        ), f"Expected 5400, got {user1_features['secs_30d']}"
-
-        # user1 had transactions on 20170228 (past) and 20170301 (future)
-        # Only past transactions should count: 1 transaction
-        assert (
-            user1_features["tx_count_total"] == 1
-        ), f"Expected 1, got {user1_features['tx_count_total']}"
-
-        # user2 had logs on 20170226 (past) and 20170302 (future)
-        # Only past logs should count: 2400 total_secs
-        assert (
-            user2_features["secs_30d"] == 2400
-        ), f"Expected 2400, got {user2_features['secs_30d']}"
-
-        # Verify cutoff_ts is correct
-        assert all(
-            result["cutoff_ts"] == "2017-02-28"
-        ), "All cutoff timestamps should be 2017-02-28"
-
-        print("✅ No future data leakage detected")
-
-
-def test_feature_sql_date_parsing():
+    # Train labels
+    train_data = pd.DataFrame({"msno": ["user1", "user2", "user3"], "is_churn": [0, 1, 0]})
+
+    # Transactions: mix of past and future dates
+    tx_data = pd.DataFrame(
+        {
+            "msno": ["user1", "user1", "user2", "user2", "user3"],
+            "transaction_date": [
+                20170228,
+                20170301,
+                20170227,
+                20170302,
+                20170226,
+            ],  # Some future!
+            "payment_plan_days": [30, 30, 30, 30, 30],
+            "is_auto_renew": [1, 1, 0, 1, 1],
+            "is_cancel": [0, 0, 0, 0, 0],
+        }
+    )
+
+    # User logs: mix of past and future dates
+    logs_data = pd.DataFrame(
+        {
+            "msno": ["user1", "user1", "user1", "user2", "user2", "user3"],
+            "date": [
+                20170227,
+                20170228,
+                20170301,
+                20170226,
+                20170302,
+                20170225,
+            ],  # Some future!
+            "total_secs": [3600, 1800, 7200, 2400, 5400, 900],
+            "num_unq": [10, 5, 20, 8, 15, 3],
+        }
+    )
+
+    # Members data
+    members_data = pd.DataFrame(
+        {
+            "msno": ["user1", "user2", "user3"],
+            "gender": ["male", "female", "male"],
+            "bd": [25, 30, 35],
+        }
+    )
+
+    # Register the frames in memory and build features through the registered-view path
+    from src.backtest import build_features
+
+    for name, df in [
+        ("train", train_data),
+        ("transactions", tx_data),
+        ("user_logs", logs_data),
+        ("members", members_data),
+    ]:
+        duck_con.register(name, df)
+    result = build_features(
+        duck_con,
+        _SQL_PATH,
+        date(2017, 2, 28),
+        "train",
+        "transactions",
+        "user_logs",
+        "members",
+        registered=True,
+    )
+
+    # Verify no future data leaked
+    print(f"Feature engineering returned {len(result)} rows")
+    print("Cutoff date: 2017-02-28")
+
+    # Check specific user feature values to ensure future data didn't leak
+    by_user = result.set_index("msno")
+    user1_features = by_user.loc["user1"]
+    user2_features = by_user.loc["user2"]
+
+    # user1 had logs on 20170227, 20170228 (past) and 20170301 (future)
+    # Only past logs should count: 3600 + 1800 = 5400 total_secs
+    assert user1_features["secs_30d"] == 5400, f"Expected 5400, got {user1_features['secs_30d']}"
+
+    # user1 had transactions on 20170228 (past) and 20170301 (future)
+    # Only past transactions should count: 1 transaction
+    assert (
+        user1_features["tx_count_total"] == 1
+    ), f"Expected 1, got {user1_features['tx_count_total']}"
+
+    # user2 had logs on 20170226 (past) and 20170302 (future)
+    # Only past logs should count: 2400 total_secs
+    assert user2_features["secs_30d"] == 2400, f"Expected 2400, got {user2_features['secs_30d']}"
+
+    # Verify cutoff_ts is correct
+    assert (result["cutoff_ts"] == "2017-02-28").all(), "All cutoff timestamps should be 2017-02-28"
+
+    print("✅ No future data leakage detected")
+
+
+def test_feature_sql_date_parsing(duck_con):
     """Test that date parsing handles edge cases correctly."""
 
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -169,20 +173,16 @@ def test_feature_sql_date_parsing():
         members_path = temp_path / "members.csv"
         members_data.to_csv(members_path, index=False)
 
-        # Read and execute SQL
-        sql_template_path = Path(__file__).parent.parent / "features" / "features_simple.sql"
-        with open(sql_template_path) as f:
-            sql_template = f.read()
-
-        sql_query = sql_template.replace("${train_path}", str(train_path))
-        sql_query = sql_query.replace("${transactions_path}", str(tx_path))
-        sql_query = sql_query.replace("${user_logs_path}", str(logs_path))
-        sql_query = sql_query.replace("${members_path}", str(members_path))
+        # Fill in paths and execute SQL
+        sql_query = _SQL_TEMPLATE.substitute(
+            train_path=str(train_path),
+            transactions_path=str(tx_path),
+            user_logs_path=str(logs_path),
+            members_path=str(members_path),
+        )
 
         # Should not raise errors despite malformed dates
-        con = duckdb.connect()
-        result = con.execute(sql_query).fetchdf()
-        con.close()
+        result = duck_con.execute(sql_query).fetchdf()
 
         assert len(result) == 1, "Should return 1 user"
         assert result.iloc[0]["tx_count_total"] == 1, "Should count only valid transactions"
@@ -191,6 +191,4 @@ def test_feature_sql_date_parsing():
 
 
 if __name__ == "__main__":
-    test_no_future_data_leakage()
-    test_feature_sql_date_parsing()
-    print("All temporal safety tests passed!")
+    raise SystemExit(pytest.main([__file__, "-v"]))
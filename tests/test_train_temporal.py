@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the temporal training script's data loading and feature preparation.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import brier_score_loss, log_loss, roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+import train_temporal
+from train_temporal import (
+    categorical_dtypes,
+    load_prepared_windows,
+    load_window_features,
+    prepare_features,
+    prepared_cache_key,
+    score_predictions,
+    standardize,
+)
+
+
+@pytest.fixture(scope="module")
+def window_frames():
+    """Two small feature windows with the columns train_temporal expects."""
+    return [
+        pd.DataFrame(
+            {
+                "msno": [f"user{i}" for i in range(start, start + 3)],
+                "is_churn": [0, 1, 0],
+                "gender": ["male", None, "female"],
+                "city": [1, 13, 5],
+                "tx_count_total": [3, 1, 0],
+                "secs_30d": [5400.0, None, 1200.5],
+            }
+        )
+        for start in (0, 3)
+    ]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_load_window_features(tmp_path, window_frames, suffix):
+    """Windows load and concatenate the same way from CSV and Parquet."""
+    paths = []
+    for i, df in enumerate(window_frames):
+        path = tmp_path / f"features_{i}{suffix}"
+        if suffix == ".parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        paths.append(str(path))
+
+    combined = load_window_features(paths)
+
+    assert len(combined) == 6
+    assert combined["msno"].tolist() == [f"user{i}" for i in range(6)]
+    assert combined["tx_count_total"].sum() == 8
+    assert combined["secs_30d"].isna().sum() == 2
+    assert combined["gender"].isna().sum() == 2
+
+
+def test_prepare_features_shares_category_codes(window_frames):
+    """Train and val encode the same category to the same code."""
+    train, val = window_frames
+    cat_dtypes = categorical_dtypes(train, val)
+
+    X_train, y_train = prepare_features(train, cat_dtypes)
+    X_val, _ = prepare_features(val, cat_dtypes)
+
+    assert {"msno", "is_churn"}.isdisjoint(X_train.columns)
+    assert y_train.tolist() == [0, 1, 0]
+    assert (X_train.dtypes == "float32").all()
+    # Categories sort to female, male, unknown
+    assert X_train["gender"].tolist() == [1, 2, 0]
+    assert X_val["gender"].tolist() == [1, 2, 0]
+    assert X_train["secs_30d"].tolist() == [5400.0, 0.0, 1200.5]
+
+
+def test_score_predictions_matches_sklearn(binom_sample):
+    """The fused metrics agree with sklearn, including when predictions tie."""
+    y_true, y_pred = binom_sample
+    # Round to two decimals so many predictions share a rank
+    y_pred = np.round(y_pred, 2)
+
+    scores = score_predictions(y_true, y_pred)
+
+    assert scores["log_loss"] == pytest.approx(log_loss(y_true, y_pred))
+    assert scores["auc"] == pytest.approx(roc_auc_score(y_true, y_pred))
+    assert scores["brier"] == pytest.approx(brier_score_loss(y_true, y_pred))
+
+
+def test_standardize_matches_scaler():
+    """Scaling from the cached statistics agrees with StandardScaler.transform."""
+    rng = np.random.default_rng(42)
+    X = rng.normal(5.0, 3.0, size=(200, 4)).astype(np.float32)
+    scaler = StandardScaler().fit(X)
+
+    scaled = standardize(
+        X, scaler.mean_.astype(np.float32), (1.0 / scaler.scale_).astype(np.float32)
+    )
+
+    assert scaled.dtype == np.float32
+    np.testing.assert_allclose(scaled, scaler.transform(X), rtol=1e-5, atol=1e-5)
+
+
+def test_load_prepared_windows_cache(tmp_path, monkeypatch, window_frames):
+    """A second load reads the Feather cache; rewriting a window changes the key."""
+    monkeypatch.setattr(train_temporal, "CACHE_DIR", tmp_path / "cache")
+    paths = []
+    for i, df in enumerate(window_frames):
+        path = tmp_path / f"features_{i}.csv"
+        df.to_csv(path, index=False)
+        paths.append(str(path))
+    train_files, val_file = paths[:1], paths[1]
+
+    first = load_prepared_windows(train_files, val_file)
+    key = prepared_cache_key(paths)
+    assert len(list((tmp_path / "cache").glob(f"prepared_{key}_*"))) == 3
+
+    second = load_prepared_windows(train_files, val_file)
+    pd.testing.assert_frame_equal(first[0], second[0])
+    pd.testing.assert_series_equal(first[3], second[3], check_names=False)
+    assert first[4] == second[4]
+
+    stat = os.stat(val_file)
+    os.utime(val_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert prepared_cache_key(paths) != key
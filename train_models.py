@@ -15,6 +15,7 @@ import sys
 from pathlib import Path
 
 import pandas as pd
+import pyarrow.parquet as pq
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent / "src"))
@@ -22,14 +23,16 @@ sys.path.append(str(Path(__file__).parent / "src"))
 from models import run_training_pipeline
 
 
-def load_features(features_path: str) -> pd.DataFrame:
-    """Load features from CSV or Parquet file."""
+def load_features(features_path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Load features (optionally only some columns) from CSV or Parquet file."""
     path = Path(features_path)
 
     if path.suffix == ".parquet":
-        return pd.read_parquet(path)
+        # Memory-map the file and let pandas take over Arrow buffers as they are converted
+        table = pq.read_table(path, columns=columns, memory_map=True, use_threads=True)
+        return table.to_pandas(self_destruct=True, split_blocks=True)
     elif path.suffix == ".csv":
-        return pd.read_csv(path)
+        return pd.read_csv(path, usecols=columns)
     else:
         raise ValueError(f"Unsupported file format: {path.suffix}")
 
@@ -54,16 +57,8 @@ def main():
         print(f"   Source: {args.features}")
 
         features_df = load_features(args.features)
-        features_path = args.features
 
         print(f"Features loaded: {features_df.shape[0]:,} samples x {features_df.shape[1]} columns")
-
-        # Save as CSV for models.py compatibility if parquet
-        if args.features.endswith(".parquet"):
-            csv_path = args.features.replace(".parquet", ".csv")
-            features_df.to_csv(csv_path, index=False)
-            features_path = csv_path
-            print(f"   Converted to CSV: {csv_path}")
     else:
         # Generate features from SQL (synthetic data)
         print("\nSTEP 1: Feature Engineering (Synthetic Data)")
@@ -74,12 +69,11 @@ def main():
             sql_file="features/features_simple.sql",
             output_file="features/features_processed.csv",
         )
-        features_path = "features/features_processed.csv"
         print(f"Features ready: {features_df.shape}")
 
     # Step 2: Train models
     print("\nSTEP 2: Model Training")
-    results = run_training_pipeline(features_path=features_path, output_dir="models")
+    results = run_training_pipeline(features_df=features_df, output_dir="models")
 
     # Step 3: Summary
     print("\nTRAINING COMPLETE - FINAL RESULTS")